@@ -1,50 +1,236 @@
+import argparse
 import os
+import sys
 import django
-import re
+from collections import defaultdict
 
 # Setup Django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 django.setup()
 
+from django.db import connection
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
 from farmers.models import Farmer
 
-def find_duplicates():
-    farmers = Farmer.objects.all()
-    profiles = {}
-    
+try:
+    import numpy as np
+    from rapidfuzz import process
+    from rapidfuzz.distance import DamerauLevenshtein
+except ImportError:
+    np = process = DamerauLevenshtein = None
+
+# Rows fetched per DB round-trip; also the size of each stdout write batch
+CHUNK_SIZE = 2000
+
+# Rows of each Soundex bucket's distance matrix computed per cdist call
+# (bounds memory to CDIST_BLOCK_ROWS x bucket size)
+CDIST_BLOCK_ROWS = 1024
+
+# Without rapidfuzz, buckets compared pair by pair in Python are capped;
+# larger ones are skipped with a warning
+PY_FUZZY_BUCKET_LIMIT = 2000
+
+# Characters stripped before comparing phones (whitespace, dashes, brackets, plus)
+_STRIP_TBL = str.maketrans('', '', ' \t\n\r\f\v-()+')
+
+# Soundex digit for each consonant; vowels, h, w and y are dropped
+_SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+# Postgres equivalent of the Python normalization below (strip separators,
+# keep the last 10 digits). Backed by farmers_phone_normalized_idx.
+NORMALIZED_PHONE_SQL = r"right(regexp_replace(phone, '[\s\-\(\)\+]', '', 'g'), 10)"
+
+
+def _duplicate_groups_sql():
+    """Group by normalized phone inside Postgres, returning only duplicate groups"""
+    from django.contrib.postgres.aggregates import ArrayAgg
+
+    rows = (
+        Farmer.objects
+        .annotate(norm=RawSQL(NORMALIZED_PHONE_SQL, []))
+        .values('norm')
+        .annotate(c=Count('id'), ids=ArrayAgg('id'), phones=ArrayAgg('phone'))
+        .filter(c__gt=1)
+        .order_by()
+    )
+    return {row['norm']: list(zip(row['ids'], row['phones'])) for row in rows}
+
+
+def _normalize_phone(phone_raw):
+    """Strip separators and reduce to the 10-digit Indian number"""
+    phone = phone_raw.translate(_STRIP_TBL)
+    if phone.startswith('91') and len(phone) == 12:
+        return phone[2:]
+    if len(phone) > 10:
+        return phone[-10:]
+    return phone
+
+
+def _soundex(name):
+    """American Soundex code of the first word of a name ('' if not Latin script)"""
+    words = name.lower().split(maxsplit=1)
+    letters = [c for c in (words[0] if words else '') if 'a' <= c <= 'z']
+    if not letters:
+        return ''
+    code = letters[0].upper()
+    prev = _SOUNDEX_CODES.get(letters[0], '')
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c, '')
+        if digit and digit != prev:
+            code += digit
+            if len(code) == 4:
+                break
+        if c not in 'hw':
+            prev = digit
+    return code.ljust(4, '0')
+
+
+def _osa_distance(a, b):
+    """Damerau-Levenshtein (optimal string alignment) distance"""
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def _close_pairs_cdist(phones, max_distance):
+    """_close_pairs on rapidfuzz's multithreaded cdist, a block of rows at a time"""
+    pairs = []
+    for start in range(0, len(phones), CDIST_BLOCK_ROWS):
+        dist = process.cdist(
+            phones[start:start + CDIST_BLOCK_ROWS], phones,
+            scorer=DamerauLevenshtein.distance, score_cutoff=max_distance,
+            dtype=np.int32, workers=-1,
+        )
+        rows, cols = np.nonzero(dist <= max_distance)
+        rows += start
+        upper = rows < cols
+        pairs.extend(zip(rows[upper].tolist(), cols[upper].tolist()))
+    return pairs
+
+
+def _close_pairs(phones, max_distance):
+    """Index pairs (i, j), i < j, whose phones are within max_distance edits"""
+    if process is not None:
+        return _close_pairs_cdist(phones, max_distance)
+    return [
+        (i, j)
+        for i in range(len(phones))
+        for j in range(i + 1, len(phones))
+        if _osa_distance(phones[i], phones[j]) <= max_distance
+    ]
+
+
+def _likely_duplicates(exact_phones, max_distance=1):
+    """
+    Second pass for typo duplicates: bucket farmers by Soundex(name) and
+    compare normalized phones within each bucket. Farmers already in an
+    exact phone group are skipped.
+    """
+    buckets = defaultdict(list)
+    farmers = Farmer.objects.values_list('id', 'phone', 'name').iterator(chunk_size=CHUNK_SIZE)
+    for fid, phone_raw, name in farmers:
+        norm_phone = _normalize_phone(phone_raw)
+        key = _soundex(name or '')
+        if key and norm_phone not in exact_phones:
+            buckets[key].append((fid, phone_raw, name, norm_phone))
+
+    matches = []
+    for key, members in buckets.items():
+        if len(members) < 2:
+            continue
+        if process is None and len(members) > PY_FUZZY_BUCKET_LIMIT:
+            print(f"Skipping Soundex bucket {key}: {len(members)} farmers "
+                  f"(install rapidfuzz and numpy to compare buckets over {PY_FUZZY_BUCKET_LIMIT})",
+                  file=sys.stderr)
+            continue
+        phones = [m[3] for m in members]
+        for i, j in _close_pairs(phones, max_distance):
+            if phones[i] != phones[j]:
+                matches.append((key, members[i], members[j]))
+    return matches
+
+
+def _print_all_farmers():
+    """Dump every farmer row (only with --verbose)"""
+    farmers = Farmer.objects.values_list('id', 'phone', 'name').iterator(chunk_size=CHUNK_SIZE)
+
     print("-" * 100)
     print(f"{'ID':<40} | {'Phone':<20} | {'Name'}")
     print("-" * 100)
-    for f in farmers:
-        print(f"{str(f.id):<40} | {f.phone:<20} | {f.name}")
-        
-        # Normalize for comparison
-        phone = re.sub(r'[\s\-\(\)\+]', '', f.phone)
-        if phone.startswith('91') and len(phone) == 12:
-            norm_phone = phone[2:]
-        elif len(phone) > 10:
-            norm_phone = phone[-10:]
-        else:
-            norm_phone = phone
-            
-        if norm_phone not in profiles:
-            profiles[norm_phone] = []
-        profiles[norm_phone].append(f)
-    
+    out = []
+    for fid, phone_raw, name in farmers:
+        out.append(f"{str(fid):<40} | {phone_raw:<20} | {name}\n")
+        if len(out) >= CHUNK_SIZE:
+            sys.stdout.write("".join(out))
+            out.clear()
+    sys.stdout.write("".join(out))
+
+
+def _duplicate_groups_python():
+    """Fallback for non-Postgres databases: stream every row and group in Python"""
+    # Stream plain tuples instead of hydrating full Farmer instances
+    farmers = Farmer.objects.values_list('id', 'phone').iterator(chunk_size=CHUNK_SIZE)
+    profiles = defaultdict(list)
+
+    for fid, phone_raw in farmers:
+        profiles[_normalize_phone(phone_raw)].append((fid, phone_raw))
+
+    return {phone: list_f for phone, list_f in profiles.items() if len(list_f) > 1}
+
+
+def find_duplicates(verbose=False, fuzzy=False):
+    if verbose:
+        _print_all_farmers()
+
+    if connection.vendor == 'postgresql':
+        groups = _duplicate_groups_sql()
+    else:
+        groups = _duplicate_groups_python()
+
     print("\n" + "=" * 100)
     print("DUPLICATE ANALYSIS")
     print("=" * 100)
-    found_duplicates = False
-    for phone, list_f in profiles.items():
-        if len(list_f) > 1:
-            found_duplicates = True
-            print(f"Phone Group: {phone} has {len(list_f)} records:")
-            for f in list_f:
-                print(f"  - ID: {f.id} (Bucket: farmer-{f.id}) phone: {f.phone}")
-    
-    if not found_duplicates:
+    for phone, list_f in groups.items():
+        print(f"Phone Group: {phone} has {len(list_f)} records:")
+        for fid, phone_raw in list_f:
+            print(f"  - ID: {fid} (Bucket: farmer-{fid}) phone: {phone_raw}")
+
+    if not groups:
         print("No duplicates found based on normalized 10-digit phone numbers.")
     print("=" * 100)
 
+    if fuzzy:
+        matches = _likely_duplicates(set(groups))
+        print("LIKELY DUPLICATES (same-sounding name, phone within 1 edit)")
+        print("=" * 100)
+        for key, a, b in matches:
+            print(f"Soundex {key}:")
+            for fid, phone_raw, name, _norm in (a, b):
+                print(f"  - ID: {fid} name: {name} phone: {phone_raw}")
+        if not matches:
+            print("No likely duplicates found.")
+        print("=" * 100)
+
 if __name__ == "__main__":
-    find_duplicates()
+    parser = argparse.ArgumentParser(description="Find farmers sharing a normalized phone number")
+    parser.add_argument('--verbose', action='store_true', help="Also list every farmer row")
+    parser.add_argument('--fuzzy', action='store_true',
+                        help="Also report likely typo duplicates (Soundex name + phone edit distance)")
+    args = parser.parse_args()
+    find_duplicates(verbose=args.verbose, fuzzy=args.fuzzy)
@@ -3,7 +3,9 @@ Applications App - Admin Configuration
 """
 
 from django.contrib import admin
+from django.utils import timezone
 from .models import Application
+from .services.status_counts import bump_status_counts_version
 
 
 @admin.register(Application)
@@ -37,15 +39,36 @@ class ApplicationAdmin(admin.ModelAdmin):
     
     actions = ['approve_applications', 'reject_applications']
     
+    def get_queryset(self, request):
+        # list_display and __str__ touch farmer and scheme on every row
+        return super().get_queryset(request).select_related('farmer', 'scheme')
+    
     def approve_applications(self, request, queryset):
-        count = 0
-        for app in queryset:
-            app.approve(verified_by=request.user.username)
-            count += 1
+        now = timezone.now()
+        farmer_ids = set(queryset.values_list('farmer_id', flat=True))
+        count = queryset.update(
+            status='APPROVED',
+            verified_at=now,
+            verified_by=request.user.username,
+            updated_at=now,
+        )
+        # update() skips post_save, so invalidate the counts cache here
+        for farmer_id in farmer_ids:
+            bump_status_counts_version(farmer_id)
         self.message_user(request, f'{count} applications approved.')
     approve_applications.short_description = 'Approve selected applications'
     
     def reject_applications(self, request, queryset):
-        count = queryset.update(status='REJECTED')
+        now = timezone.now()
+        farmer_ids = set(queryset.values_list('farmer_id', flat=True))
+        count = queryset.update(
+            status='REJECTED',
+            verified_at=now,
+            verified_by=request.user.username,
+            updated_at=now,
+        )
+        # update() skips post_save, so invalidate the counts cache here
+        for farmer_id in farmer_ids:
+            bump_status_counts_version(farmer_id)
         self.message_user(request, f'{count} applications rejected.')
     reject_applications.short_description = 'Reject selected applications'
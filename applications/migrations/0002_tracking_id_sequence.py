@@ -0,0 +1,45 @@
+"""
+Server-side tracking IDs: APP-<year>-<n> drawn from a sequence.
+The applications table is unmanaged (lives in Supabase), so the sequence,
+function and column default are created with raw SQL and only on PostgreSQL.
+The sequence starts at 100000 so it never collides with the 5-digit random
+IDs issued before it existed.
+"""
+
+from django.db import migrations
+
+
+def create_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE SEQUENCE IF NOT EXISTS applications_tracking_seq START WITH 100000"
+    )
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION applications_next_tracking_id() RETURNS text "
+        "LANGUAGE sql AS "
+        "$$ SELECT 'APP-' || to_char(now(), 'YYYY') || '-' || nextval('applications_tracking_seq') $$"
+    )
+    schema_editor.execute(
+        "ALTER TABLE applications ALTER COLUMN tracking_id "
+        "SET DEFAULT applications_next_tracking_id()"
+    )
+
+
+def drop_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("ALTER TABLE applications ALTER COLUMN tracking_id DROP DEFAULT")
+    schema_editor.execute("DROP FUNCTION IF EXISTS applications_next_tracking_id()")
+    schema_editor.execute("DROP SEQUENCE IF EXISTS applications_tracking_seq")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_sequence, drop_sequence),
+    ]
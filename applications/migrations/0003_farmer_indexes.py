@@ -0,0 +1,39 @@
+"""
+Composite indexes for the per-farmer application queries: status counts
+group by (farmer_id, status) and the list view orders by created_at.
+The applications table is unmanaged (lives in Supabase), so the indexes are
+created with raw SQL and only on PostgreSQL.
+"""
+
+from django.db import migrations
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS applications_farmer_status_idx "
+        "ON applications (farmer_id, status)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS applications_farmer_created_idx "
+        "ON applications (farmer_id, created_at DESC)"
+    )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS applications_farmer_created_idx")
+    schema_editor.execute("DROP INDEX IF EXISTS applications_farmer_status_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_tracking_id_sequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -4,9 +4,18 @@ Enhanced with tracking and confirmation fields
 """
 
 import uuid
-from django.db import models
+import random
+from django.db import models, connection, transaction, IntegrityError
+from django.db.models.expressions import RawSQL
 from django.utils import timezone
 
+from core.fields import OrjsonField
+
+
+class TrackingIdField(models.CharField):
+    """CharField read back via INSERT ... RETURNING (value may come from the DB)"""
+    db_returning = True
+
 
 class Application(models.Model):
     """
@@ -14,15 +23,16 @@ class Application(models.Model):
     Includes tracking, confirmation, and document attachment.
     """
     
-    STATUS_CHOICES = [
-        ('DRAFT', 'Draft'),
-        ('PENDING_CONFIRMATION', 'Pending Farmer Confirmation'),
-        ('PENDING', 'Pending Review'),
-        ('UNDER_REVIEW', 'Under Review'),
-        ('APPROVED', 'Approved'),
-        ('REJECTED', 'Rejected'),
-        ('INCOMPLETE', 'Incomplete Documents'),
-    ]
+    class Status(models.TextChoices):
+        DRAFT = 'DRAFT', 'Draft'
+        PENDING_CONFIRMATION = 'PENDING_CONFIRMATION', 'Pending Farmer Confirmation'
+        PENDING = 'PENDING', 'Pending Review'
+        UNDER_REVIEW = 'UNDER_REVIEW', 'Under Review'
+        APPROVED = 'APPROVED', 'Approved'
+        REJECTED = 'REJECTED', 'Rejected'
+        INCOMPLETE = 'INCOMPLETE', 'Incomplete Documents'
+    
+    STATUS_CHOICES = Status.choices
     
     id = models.UUIDField(
         primary_key=True, 
@@ -31,7 +41,7 @@ class Application(models.Model):
     )
     
     # Tracking ID for government reference (human readable)
-    tracking_id = models.CharField(
+    tracking_id = TrackingIdField(
         max_length=20,
         unique=True,
         null=True,
@@ -54,26 +64,26 @@ class Application(models.Model):
     )
     
     # Unified form with auto-filled data
-    auto_filled_data = models.JSONField(
+    auto_filled_data = OrjsonField(
         default=dict,
         help_text="Unified form with basic_details, attached_documents, scheme_info"
     )
     
     # Attached documents from Supabase storage
-    attached_documents = models.JSONField(
+    attached_documents = OrjsonField(
         default=list,
         help_text="Documents attached from farmer's storage bucket with signed URLs"
     )
     
     status = models.CharField(
         max_length=25,
-        choices=STATUS_CHOICES,
-        default='DRAFT',
+        choices=Status.choices,
+        default=Status.DRAFT,
         db_index=True
     )
     
-    documents_submitted = models.JSONField(default=list)
-    missing_documents = models.JSONField(default=list)
+    documents_submitted = OrjsonField(default=list)
+    missing_documents = OrjsonField(default=list)
     
     # Confirmation tracking
     is_confirmed = models.BooleanField(
@@ -119,46 +129,131 @@ class Application(models.Model):
     def __str__(self):
         return f"{self.tracking_id or self.id} - {self.farmer.name} ({self.status})"
     
+    # Attempts at a fresh tracking ID before giving up on a unique-constraint clash
+    TRACKING_ID_ATTEMPTS = 3
+    
     def save(self, *args, **kwargs):
-        # Generate tracking ID if not exists
-        if not self.tracking_id:
+        if self.tracking_id:
+            super().save(*args, **kwargs)
+            return
+        
+        if kwargs.get('update_fields') is not None:
+            # Legacy row without an ID: make sure the new one gets written
+            kwargs['update_fields'] = [*kwargs['update_fields'], 'tracking_id']
+        
+        if connection.vendor == 'postgresql':
+            # Drawn from applications_tracking_seq (migration 0002) and
+            # returned by the INSERT itself - no collisions, no retries
+            self.tracking_id = RawSQL('applications_next_tracking_id()', [])
+            try:
+                super().save(*args, **kwargs)
+            except Exception:
+                self.tracking_id = None
+                raise
+            if isinstance(self.tracking_id, RawSQL):
+                # UPDATE of a legacy row without an ID: nothing was RETURNed
+                self.refresh_from_db(fields=['tracking_id'])
+            return
+        
+        # Generate tracking ID, retrying on the rare collision
+        for attempt in range(self.TRACKING_ID_ATTEMPTS):
             self.tracking_id = self.generate_tracking_id()
-        super().save(*args, **kwargs)
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                # Only a tracking ID clash is worth another draw; anything else
+                # (e.g. the unique farmer/scheme pair) would fail the same way
+                tracking_id_taken = (
+                    Application.objects
+                    .filter(tracking_id=self.tracking_id)
+                    .exclude(pk=self.pk)
+                    .exists()
+                )
+                if not tracking_id_taken or attempt == self.TRACKING_ID_ATTEMPTS - 1:
+                    self.tracking_id = None
+                    raise
     
     @staticmethod
     def generate_tracking_id():
-        """Generate human-readable tracking ID"""
-        import random
-        year = timezone.now().year
-        random_part = ''.join([str(random.randint(0, 9)) for _ in range(5)])
-        return f"APP-{year}-{random_part}"
+        """Generate human-readable tracking ID (non-Postgres fallback)"""
+        return f"APP-{timezone.now().year}-{random.randrange(100000):05d}"
     
     def confirm(self):
         """Farmer confirms the application - ready for submission"""
         self.is_confirmed = True
         self.confirmed_at = timezone.now()
-        self.status = 'PENDING'
+        self.status = self.Status.PENDING
         self.submitted_at = timezone.now()
-        self.save()
+        self.save(update_fields=['is_confirmed', 'confirmed_at', 'status', 'submitted_at', 'updated_at'])
     
     def approve(self, verified_by=None, government_reference=None):
         """Approve the application"""
-        self.status = 'APPROVED'
+        self.status = self.Status.APPROVED
         self.verified_at = timezone.now()
+        fields = ['status', 'verified_at', 'updated_at']
         if verified_by:
             self.verified_by = verified_by
+            fields.append('verified_by')
         if government_reference:
             self.government_reference = government_reference
-        self.save()
+            fields.append('government_reference')
+        self.save(update_fields=fields)
     
     def reject(self, reason, verified_by=None):
         """Reject the application"""
-        self.status = 'REJECTED'
+        self.status = self.Status.REJECTED
         self.rejection_reason = reason
         self.verified_at = timezone.now()
+        fields = ['status', 'rejection_reason', 'verified_at', 'updated_at']
         if verified_by:
             self.verified_by = verified_by
-        self.save()
+            fields.append('verified_by')
+        self.save(update_fields=fields)
+    
+    @property
+    def status_display(self):
+        """Human-readable status (enum lookup instead of scanning the field choices)"""
+        try:
+            return self.Status(self.status).label
+        except ValueError:
+            return self.status
+    
+    @property
+    def documents_complete(self):
+        """True once no required document is missing"""
+        return not self.missing_documents
+    
+    # Columns read by AutoFillService.confirm_application() and written by confirm()
+    CONFIRM_FIELDS = (
+        'id', 'farmer', 'tracking_id', 'status', 'is_confirmed',
+        'missing_documents', 'confirmed_at', 'submitted_at', 'updated_at',
+    )
+    
+    # Columns read by get_tracking_info() and TrackApplicationView
+    TRACKING_FIELDS = (
+        'id', 'tracking_id', 'status', 'is_confirmed', 'confirmed_at',
+        'submitted_at', 'government_reference', 'verified_at',
+        'rejection_reason', 'created_at', 'updated_at',
+        'attached_documents', 'missing_documents', 'scheme',
+        'scheme__name', 'scheme__name_hindi', 'scheme__name_marathi',
+        'scheme__benefit_amount',
+    )
+    
+    def get_draft_info(self):
+        """Form state returned by the generate-form flow (new and existing drafts)"""
+        return {
+            'application_id': str(self.id),
+            'tracking_id': self.tracking_id,
+            'status': self.status,
+            'is_confirmed': self.is_confirmed,
+            'unified_form': self.auto_filled_data,
+            'attached_documents': self.attached_documents,
+            'missing_documents': self.missing_documents,
+            'documents_complete': self.documents_complete,
+            'can_confirm': self.status == self.Status.PENDING_CONFIRMATION,
+        }
     
     def get_tracking_info(self):
         """Get tracking information for the application"""
@@ -167,13 +262,13 @@ class Application(models.Model):
             'application_id': str(self.id),
             'scheme_name': self.scheme.name,
             'status': self.status,
-            'status_display': self.get_status_display(),
+            'status_display': self.status_display,
             'is_confirmed': self.is_confirmed,
             'confirmed_at': self.confirmed_at.isoformat() if self.confirmed_at else None,
             'submitted_at': self.submitted_at.isoformat() if self.submitted_at else None,
             'government_reference': self.government_reference,
             'verified_at': self.verified_at.isoformat() if self.verified_at else None,
-            'rejection_reason': self.rejection_reason if self.status == 'REJECTED' else None,
+            'rejection_reason': self.rejection_reason if self.status == self.Status.REJECTED else None,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
         }
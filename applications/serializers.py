@@ -11,7 +11,7 @@ class ApplicationSerializer(serializers.ModelSerializer):
     """Full application serializer"""
     scheme_name = serializers.CharField(source='scheme.name', read_only=True)
     farmer_name = serializers.CharField(source='farmer.name', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    status_display = serializers.CharField(read_only=True)
     
     class Meta:
         model = Application
@@ -27,7 +27,21 @@ class ApplicationSerializer(serializers.ModelSerializer):
 
 
 class ApplicationListSerializer(serializers.ModelSerializer):
-    """Minimal application info for listings"""
+    """
+    Minimal application info for listings.
+    Build querysets with setup_queryset() - loads only the columns used here.
+    """
+    # Columns read by this serializer; keep in sync with Meta.fields
+    QUERY_FIELDS = (
+        'id', 'status', 'created_at', 'scheme',
+        'scheme__name', 'scheme__name_hindi', 'scheme__benefit_amount',
+    )
+    
+    @classmethod
+    def setup_queryset(cls, queryset):
+        """Join scheme and skip unused columns (farmer, JSON payloads)"""
+        return queryset.select_related('scheme').only(*cls.QUERY_FIELDS)
+    
     scheme_name = serializers.CharField(source='scheme.name', read_only=True)
     scheme_name_hindi = serializers.CharField(source='scheme.name_hindi', read_only=True)
     benefit_amount = serializers.DecimalField(
@@ -35,7 +49,7 @@ class ApplicationListSerializer(serializers.ModelSerializer):
         max_digits=12, decimal_places=2,
         read_only=True
     )
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    status_display = serializers.CharField(read_only=True)
     
     class Meta:
         model = Application
@@ -3,10 +3,19 @@ Applications App - Enhanced Auto-Fill Service
 Generates unified application forms with Supabase document integration
 """
 
+import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from decimal import Decimal
 
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+
+# Runs Supabase document lookups alongside DB work (eligibility checks)
+_io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='autofill-io')
+
 
 class AutoFillService:
     """
@@ -15,7 +24,8 @@ class AutoFillService:
     """
     
     @classmethod
-    def generate_unified_form(cls, farmer, scheme) -> Dict[str, Any]:
+    def generate_unified_form(cls, farmer, scheme, document_result=None,
+                              now: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate a unified application form structure.
         
@@ -27,18 +37,26 @@ class AutoFillService:
         Args:
             farmer: Farmer model instance
             scheme: Scheme model instance
+            document_result: Optional result of fetch_required_documents
+                if the caller already has it
+            now: Optional ISO timestamp for form_generated_at, so batch
+                callers can stamp every form with one clock read
         
         Returns:
             Complete unified form structure
         """
         from .supabase_storage import SupabaseStorageService
         
+        now = now or datetime.now().isoformat()
+        language = farmer.language
+        
         # Fetch documents from Supabase storage
-        required_docs = scheme.required_documents or []
-        document_result = SupabaseStorageService.fetch_required_documents(
-            str(farmer.id), 
-            required_docs
-        )
+        if document_result is None:
+            required_docs = scheme.required_documents or []
+            document_result = SupabaseStorageService.fetch_required_documents(
+                str(farmer.id), 
+                required_docs
+            )
         
         # Build unified form
         unified_form = {
@@ -59,9 +77,9 @@ class AutoFillService:
             'scheme_info': {
                 'scheme_id': str(scheme.id),
                 'scheme_name': scheme.name,
-                'scheme_name_localized': scheme.get_localized_name(farmer.language),
+                'scheme_name_localized': scheme.get_localized_name(language),
                 'benefit_amount': float(scheme.benefit_amount),
-                'description': scheme.get_localized_description(farmer.language),
+                'description': scheme.get_localized_description(language),
             },
             
             # Attached Documents (from Supabase bucket)
@@ -78,8 +96,8 @@ class AutoFillService:
             
             # Metadata
             'metadata': {
-                'form_generated_at': datetime.now().isoformat(),
-                'language': farmer.language,
+                'form_generated_at': now,
+                'language': language,
                 'auto_filled': True,
                 'form_version': '2.0',
             }
@@ -88,14 +106,14 @@ class AutoFillService:
         return unified_form
     
     @classmethod
-    def generate_application_data(cls, farmer, scheme) -> Dict[str, Any]:
+    def generate_application_data(cls, farmer, scheme, now: Optional[str] = None) -> Dict[str, Any]:
         """
         Legacy method - now wraps generate_unified_form for backward compatibility.
         """
-        return cls.generate_unified_form(farmer, scheme)
+        return cls.generate_unified_form(farmer, scheme, now=now)
     
     @classmethod
-    def create_draft_application(cls, farmer, scheme) -> tuple:
+    def create_draft_application(cls, farmer, scheme, now: Optional[str] = None) -> tuple:
         """
         Create a draft application with auto-filled data.
         Application is in DRAFT status until farmer confirms.
@@ -103,25 +121,37 @@ class AutoFillService:
         Args:
             farmer: Farmer model instance
             scheme: Scheme model instance
+            now: Optional precomputed ISO timestamp (see generate_unified_form)
         
         Returns:
             Tuple of (Application instance, created boolean)
         """
         from applications.models import Application
         from schemes.services.eligibility_engine import EligibilityEngine
+        from .supabase_storage import SupabaseStorageService
+        
+        # Check if application already exists (probe the id only; the full
+        # row with its JSON payloads is loaded just when there is one)
+        existing_id = Application.objects.filter(
+            farmer=farmer, scheme=scheme
+        ).values_list('id', flat=True).first()
+        if existing_id:
+            return Application.objects.get(id=existing_id), False
         
-        # Check if application already exists
-        existing = Application.objects.filter(farmer=farmer, scheme=scheme).first()
-        if existing:
-            return existing, False
+        # Fetch documents from storage while eligibility is checked against the DB
+        docs_future = _io_pool.submit(
+            SupabaseStorageService.fetch_required_documents,
+            str(farmer.id),
+            scheme.required_documents or []
+        )
         
-        # Check eligibility
-        eligibility = EligibilityEngine.check_eligibility(farmer, scheme)
-        if not eligibility['eligible']:
+        # Check eligibility (only the verdict is needed here)
+        if not EligibilityEngine.is_eligible(farmer, scheme):
+            docs_future.cancel()
             return None, False
         
         # Generate unified form
-        unified_form = cls.generate_unified_form(farmer, scheme)
+        unified_form = cls.generate_unified_form(farmer, scheme, docs_future.result(), now=now)
         
         # Determine status based on documents
         if unified_form['documents_complete']:
@@ -129,25 +159,28 @@ class AutoFillService:
         else:
             initial_status = 'INCOMPLETE'
         
-        # Create application
-        application = Application.objects.create(
+        # Create application; get_or_create falls back to the row a concurrent
+        # request inserted if unique (farmer, scheme) is hit
+        application, created = Application.objects.get_or_create(
             farmer=farmer,
             scheme=scheme,
-            auto_filled_data=unified_form,
-            attached_documents=unified_form['attached_documents'],
-            status=initial_status,
-            documents_submitted=[doc['document_type'] for doc in unified_form['attached_documents']],
-            missing_documents=[doc['document_type'] for doc in unified_form['missing_documents']]
+            defaults=dict(
+                auto_filled_data=unified_form,
+                attached_documents=unified_form['attached_documents'],
+                status=initial_status,
+                documents_submitted=[doc['document_type'] for doc in unified_form['attached_documents']],
+                missing_documents=[doc['document_type'] for doc in unified_form['missing_documents']],
+            )
         )
         
-        return application, True
+        return application, created
     
     @classmethod
-    def create_application(cls, farmer, scheme):
+    def create_application(cls, farmer, scheme, now: Optional[str] = None):
         """
         Create and auto-submit application (legacy flow for quick apply).
         """
-        application, created = cls.create_draft_application(farmer, scheme)
+        application, created = cls.create_draft_application(farmer, scheme, now=now)
         
         if created and application and application.status == 'PENDING_CONFIRMATION':
             # Auto-confirm for legacy flow
@@ -200,7 +233,7 @@ class AutoFillService:
         
         # Format for display
         preview = {
-            'title': f'Application for {scheme.get_localized_name(farmer.language)}',
+            'title': f"Application for {unified_form['scheme_info']['scheme_name_localized']}",
             'benefit': f'₹{scheme.benefit_amount:,.2f}',
             
             # Form fields for display
@@ -237,18 +270,24 @@ class AutoFillService:
         """
         Refresh document attachments from Supabase storage.
         Useful when farmer uploads new documents.
+        The passed instance is updated in place, so callers need not reload it.
         """
         from .supabase_storage import SupabaseStorageService
         
-        farmer = application.farmer
-        scheme = application.scheme
-        required_docs = scheme.required_documents or []
-        
-        # Re-fetch documents
+        # Re-fetch documents, bypassing any cached lookup
+        farmer_id = str(application.farmer_id)
+        SupabaseStorageService.invalidate_documents_cache(farmer_id)
         document_result = SupabaseStorageService.fetch_required_documents(
-            str(farmer.id),
-            required_docs
+            farmer_id,
+            application.scheme.required_documents or []
         )
+        return cls._apply_document_result(application, document_result)
+    
+    @classmethod
+    def _apply_document_result(cls, application, document_result) -> Dict[str, Any]:
+        """Write a fresh document lookup onto the application and persist it"""
+        from applications.models import Application
+        from .status_counts import bump_status_counts_version
         
         # Update application
         application.attached_documents = document_result['found']
@@ -265,7 +304,34 @@ class AutoFillService:
             application.auto_filled_data['missing_documents'] = document_result['missing']
             application.auto_filled_data['documents_complete'] = document_result['all_found']
         
-        application.save()
+        if connection.vendor == 'postgresql' and application.auto_filled_data:
+            # Patch only the three form keys in place instead of rewriting the blob
+            application.updated_at = timezone.now()
+            Application.objects.filter(id=application.id).update(
+                attached_documents=application.attached_documents,
+                documents_submitted=application.documents_submitted,
+                missing_documents=application.missing_documents,
+                status=application.status,
+                updated_at=application.updated_at,
+                auto_filled_data=RawSQL(
+                    "jsonb_set(jsonb_set(jsonb_set(auto_filled_data::jsonb, "
+                    "'{attached_documents}', %s::jsonb), "
+                    "'{missing_documents}', %s::jsonb), "
+                    "'{documents_complete}', %s::jsonb)",
+                    [
+                        json.dumps(document_result['found']),
+                        json.dumps(document_result['missing']),
+                        json.dumps(document_result['all_found']),
+                    ]
+                ),
+            )
+            # update() skips post_save, and the status may have moved
+            bump_status_counts_version(application.farmer_id)
+        else:
+            application.save(update_fields=[
+                'attached_documents', 'documents_submitted', 'missing_documents',
+                'status', 'auto_filled_data', 'updated_at',
+            ])
         
         return {
             'success': True,
@@ -0,0 +1,51 @@
+"""
+Applications - Per-farmer status counts
+Cached under a per-farmer version key that is bumped whenever one of the
+farmer's applications is saved, deleted or bulk-updated.
+"""
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from core.cache_versions import bump_cache_version, get_cache_version
+
+# Bounds cache growth, and staleness in processes that don't share the cache
+STATUS_COUNTS_TIMEOUT = 300
+
+
+def _version_key(farmer_id) -> str:
+    return f"appcounts_ver:{farmer_id}"
+
+
+def bump_status_counts_version(farmer_id) -> None:
+    """Invalidate a farmer's cached status counts"""
+    bump_cache_version(_version_key(farmer_id))
+
+
+def _compute_status_counts(farmer) -> dict:
+    """One GROUP BY query over the farmer's applications"""
+    from applications.models import Application
+    
+    rows = (
+        Application.objects
+        .filter(farmer=farmer)
+        .order_by()
+        .values_list('status')
+        .annotate(n=Count('id'))
+    )
+    counts = {app_status.lower(): n for app_status, n in rows}
+    
+    status_counts = {'total': sum(counts.values())}
+    for app_status in Application.Status.values:
+        status_counts[app_status.lower()] = counts.get(app_status.lower(), 0)
+    return status_counts
+
+
+def get_status_counts(farmer) -> dict:
+    """Per-status application counts for a farmer (cached)"""
+    version = get_cache_version(_version_key(farmer.id))
+    return cache.get_or_set(
+        f"appcounts:{farmer.id}:{version}",
+        lambda: _compute_status_counts(farmer),
+        STATUS_COUNTS_TIMEOUT
+    )
@@ -4,17 +4,46 @@ Handles document fetching from farmer storage buckets
 With proper document type normalization and alias mapping
 """
 
-import os
+import re
+import time
+import logging
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-from decouple import config
+from urllib.parse import quote
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+
+from core.storage import (
+    get_bucket_name, get_documents_version, bump_documents_version, get_supabase_client,
+    signed_url_cache_key, signed_url_cache_timeout
+)
 
 try:
-    from supabase import create_client, Client
+    from supabase import Client
 except ImportError:
-    create_client = None
     Client = None
 
+logger = logging.getLogger(__name__)
+
+# Signs documents in parallel when the storage client has no batch endpoint
+_signer_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='storage-sign')
+
+
+@dataclass
+class FarmerDocument:
+    """One file in a farmer's bucket (slotted: listings can be long and are cached)"""
+    __slots__ = ('filename', 'document_type', 'size', 'created_at', 'updated_at')
+    filename: str
+    document_type: str
+    size: int
+    created_at: Optional[str]
+    updated_at: Optional[str]
+
 
 class SupabaseStorageService:
     """
@@ -25,6 +54,13 @@ class SupabaseStorageService:
     
     _client: Optional[Client] = None
     
+    # Signed URL lifetime. Signed URLs are reused for half of it, and document
+    # lookups built from them are cached for the other half minus a minute,
+    # so a cached lookup never hands out an expired URL
+    SIGNED_URL_EXPIRES_IN = 3600
+    DOCUMENTS_CACHE_TIMEOUT = SIGNED_URL_EXPIRES_IN // 2 - 60
+    BUCKET_LIST_CACHE_TIMEOUT = 30
+    
     # Standard document types matching scheme requirements
     DOCUMENT_TYPES = {
         'aadhaar': ['aadhaar.pdf', 'aadhaar.jpg', 'aadhaar.png'],
@@ -42,6 +78,21 @@ class SupabaseStorageService:
         'eight_a': ['eight_a.pdf', 'eight_a.png', '8a.pdf', '8_a.pdf'],
     }
     
+    # Lowercased patterns per type, computed once for the filename scan
+    _TYPE_PATTERNS = {
+        doc_type: tuple(pattern.lower() for pattern in patterns)
+        for doc_type, patterns in DOCUMENT_TYPES.items()
+    }
+    
+    # Filename stem (no extension) -> document type, for canonically-named
+    # uploads: the type names themselves plus the stems of every pattern
+    # (passbook, kcc, 7_12_extract, ...). Earlier types win on a clash.
+    _STEM_TO_TYPE = {
+        stem: doc_type
+        for doc_type, patterns in reversed(DOCUMENT_TYPES.items())
+        for stem in (*(pattern.lower().rpartition('.')[0] for pattern in patterns), doc_type)
+    }
+    
     # Alias mapping: Maps human-readable scheme requirement names to internal document types
     # This handles the mismatch between scheme.required_documents and actual filenames
     DOCUMENT_ALIASES = {
@@ -103,11 +154,25 @@ class SupabaseStorageService:
         'training certificate (if applicable)': 'training_certificate',
     }
     
+    # Finds aliases embedded in longer requirement strings, e.g.
+    # "Bank Account Linked to Aadhaar (DBT enabled)". Longest alternatives
+    # come first so the regex engine prefers them at each position.
+    _ALIAS_PATTERN = re.compile(
+        r'(?<!\w)(?:' + '|'.join(
+            re.escape(alias) for alias in sorted(DOCUMENT_ALIASES, key=len, reverse=True)
+        ) + r')(?!\w)'
+    )
+    
+    # Separators folded to '_' when a requirement matches no known type
+    _SNAKE_CASE_TABLE = str.maketrans({' ': '_', '-': '_', '/': '_'})
+    
     @classmethod
+    @lru_cache(maxsize=512)
     def normalize_document_type(cls, doc_type: str) -> str:
         """
         Normalize document type from scheme requirement to internal type.
         Handles case-insensitive matching and aliases.
+        Memoized: the same scheme requirement strings recur for every farmer.
         """
         if not doc_type:
             return doc_type
@@ -123,37 +188,57 @@ class SupabaseStorageService:
         if doc_lower in cls.DOCUMENT_ALIASES:
             return cls.DOCUMENT_ALIASES[doc_lower]
         
+        # Alias inside a longer description - take the longest one found
+        matches = cls._ALIAS_PATTERN.findall(doc_lower)
+        if matches:
+            return cls.DOCUMENT_ALIASES[max(matches, key=len)]
+        
         # Default: convert to snake_case
-        return doc_lower.replace(' ', '_').replace('-', '_').replace('/', '_')
+        return doc_lower.translate(cls._SNAKE_CASE_TABLE)
     
     @classmethod
     def get_client(cls) -> Optional[Client]:
-        """Get or create Supabase client"""
+        """
+        Get the Supabase client.
+        Shares the process-wide client from core.storage (created once under
+        a lock) unless one has been set explicitly on the class.
+        """
         if cls._client is None:
-            supabase_url = config('SUPABASE_URL', default='')
-            supabase_key = config('SUPABASE_SERVICE_KEY', default='') or config('SUPABASE_KEY', default='')
-            
-            if supabase_url and supabase_key and create_client:
-                cls._client = create_client(supabase_url, supabase_key)
+            cls._client = get_supabase_client()
         
         return cls._client
     
     @classmethod
     def get_farmer_bucket_name(cls, farmer_id: str) -> str:
-        """Generate bucket name for a farmer"""
-        return f"farmer-{farmer_id}"
+        """Generate bucket name for a farmer (same naming as core.storage)"""
+        return get_bucket_name(farmer_id)
     
     @classmethod
-    def list_farmer_documents(cls, farmer_id: str) -> List[Dict[str, Any]]:
+    def list_farmer_documents(cls, farmer_id: str) -> List['FarmerDocument']:
         """
         List all documents in a farmer's bucket.
         
+        Listings are cached briefly (and dropped when the bucket changes) so
+        several lookups in one request path share a single Storage call.
+        
         Returns:
-            List of document info dicts with type, filename, and size
+            List of FarmerDocument records with type, filename, and size
         """
+        cache_key = f"bucket_list:{farmer_id}:{get_documents_version(farmer_id)}"
+        documents = cache.get(cache_key)
+        if documents is None:
+            documents = cls._list_farmer_documents(farmer_id)
+            # An empty listing may be a transient error - don't pin it
+            if documents:
+                cache.set(cache_key, documents, timeout=cls.BUCKET_LIST_CACHE_TIMEOUT)
+        return documents
+    
+    @classmethod
+    def _list_farmer_documents(cls, farmer_id: str) -> List['FarmerDocument']:
+        """Uncached listing behind list_farmer_documents"""
         client = cls.get_client()
         if not client:
-            print(f"No Supabase client available")
+            logger.warning("No Supabase client available")
             return []
         
         bucket_name = cls.get_farmer_bucket_name(farmer_id)
@@ -166,18 +251,20 @@ class SupabaseStorageService:
             for file in files:
                 if file.get('name'):
                     doc_type = cls._identify_document_type(file['name'])
-                    documents.append({
-                        'filename': file['name'],
-                        'document_type': doc_type,
-                        'size': file.get('metadata', {}).get('size', 0),
-                        'created_at': file.get('created_at'),
-                        'updated_at': file.get('updated_at'),
-                    })
+                    documents.append(FarmerDocument(
+                        filename=file['name'],
+                        document_type=doc_type,
+                        size=file.get('metadata', {}).get('size', 0),
+                        created_at=file.get('created_at'),
+                        updated_at=file.get('updated_at'),
+                    ))
             
-            print(f"Found {len(documents)} documents in bucket {bucket_name}: {[d['document_type'] for d in documents]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Found %d documents in bucket %s: %s",
+                             len(documents), bucket_name, [d.document_type for d in documents])
             return documents
         except Exception as e:
-            print(f"Error listing documents for farmer {farmer_id}: {e}")
+            logger.error("Error listing documents for farmer %s: %s", farmer_id, e)
             return []
     
     @classmethod
@@ -185,10 +272,17 @@ class SupabaseStorageService:
         """Identify document type from filename"""
         filename_lower = filename.lower()
         
+        stem = filename_lower.rpartition('.')[0] or filename_lower
+        doc_type = cls._STEM_TO_TYPE.get(stem)
+        if doc_type is not None:
+            return doc_type
+        
         # Check against known patterns
-        for doc_type, patterns in cls.DOCUMENT_TYPES.items():
+        for doc_type, patterns in cls._TYPE_PATTERNS.items():
+            if filename_lower.startswith(doc_type):
+                return doc_type
             for pattern in patterns:
-                if pattern.lower() in filename_lower or filename_lower.startswith(doc_type):
+                if pattern in filename_lower:
                     return doc_type
         
         # Default: use filename without extension as type
@@ -196,25 +290,151 @@ class SupabaseStorageService:
         return base_name.lower().replace(' ', '_')
     
     @classmethod
-    def get_document_signed_url(cls, farmer_id: str, filename: str, expires_in: int = 3600) -> Optional[str]:
+    def get_document_signed_url(cls, farmer_id: str, filename: str, expires_in: int = SIGNED_URL_EXPIRES_IN) -> Optional[str]:
         """
         Get a signed URL for a document.
         """
+        cache_key = cls._signed_url_cache_key(farmer_id, filename, expires_in)
+        signed_url = cache.get(cache_key)
+        if signed_url:
+            return signed_url
+        
+        if settings.SUPABASE_JWT_SECRET:
+            signed_url = cls._sign_locally(farmer_id, filename, expires_in)
+        else:
+            client = cls.get_client()
+            if not client:
+                return None
+            
+            bucket = client.storage.from_(cls.get_farmer_bucket_name(farmer_id))
+            signed_url = cls._create_signed_url(bucket, filename, expires_in)
+        
+        if signed_url:
+            cache.set(cache_key, signed_url, timeout=cls._signed_url_cache_timeout(expires_in))
+        return signed_url
+    
+    @staticmethod
+    def _create_signed_url(bucket, filename: str, expires_in: int) -> Optional[str]:
+        """One uncached create_signed_url call (None on error)"""
+        try:
+            response = bucket.create_signed_url(filename, expires_in)
+            return response.get('signedURL') or response.get('signedUrl')
+        except Exception as e:
+            logger.error("Error getting signed URL for %s: %s", filename, e)
+            return None
+    
+    @classmethod
+    def _signed_url_cache_key(cls, farmer_id: str, filename: str, expires_in: int) -> str:
+        # Not versioned (see core.storage), so forced refreshes need not re-sign
+        return signed_url_cache_key(farmer_id, filename, expires_in)
+    
+    @staticmethod
+    def _signed_url_cache_timeout(expires_in: int) -> int:
+        return signed_url_cache_timeout(expires_in)
+    
+    @classmethod
+    def get_document_signed_urls(cls, farmer_id: str, filenames: List[str],
+                                 expires_in: int = SIGNED_URL_EXPIRES_IN) -> Dict[str, Optional[str]]:
+        """
+        Sign several documents in one Storage API request.
+        A failed batch is not retried file by file - that would multiply
+        requests exactly when Storage is struggling or rate limiting.
+        
+        Returns:
+            Dict mapping filename to signed URL (None where signing failed)
+        """
+        if not filenames:
+            return {}
+        
+        # Serve what we can from the signed-URL cache
+        keys = {
+            filename: cls._signed_url_cache_key(farmer_id, filename, expires_in)
+            for filename in filenames
+        }
+        cached = cache.get_many(list(keys.values()))
+        urls = {filename: cached.get(key) for filename, key in keys.items()}
+        to_sign = [filename for filename, url in urls.items() if not url]
+        if not to_sign:
+            return urls
+        
+        if settings.SUPABASE_JWT_SECRET:
+            signed = {
+                filename: cls._sign_locally(farmer_id, filename, expires_in)
+                for filename in to_sign
+            }
+        else:
+            signed = cls._sign_remotely(farmer_id, to_sign, expires_in)
+            if signed is None:
+                return urls
+        
+        new_urls = {filename: signed.get(filename) for filename in to_sign}
+        cache.set_many(
+            {keys[filename]: url for filename, url in new_urls.items() if url},
+            timeout=cls._signed_url_cache_timeout(expires_in)
+        )
+        urls.update(new_urls)
+        return urls
+    
+    @classmethod
+    def _sign_remotely(cls, farmer_id: str, filenames: List[str],
+                       expires_in: int) -> Optional[Dict[str, Optional[str]]]:
+        """Sign through the Storage API (None if there is no client or the batch failed)"""
         client = cls.get_client()
         if not client:
             return None
         
         bucket_name = cls.get_farmer_bucket_name(farmer_id)
+        bucket = client.storage.from_(bucket_name)
+        
+        if not hasattr(bucket, 'create_signed_urls'):
+            # storage client without the batch endpoint: sign concurrently instead
+            return dict(zip(filenames, _signer_pool.map(
+                lambda filename: cls._create_signed_url(bucket, filename, expires_in),
+                filenames
+            )))
         
         try:
-            response = client.storage.from_(bucket_name).create_signed_url(
-                filename, 
-                expires_in
-            )
-            return response.get('signedURL') or response.get('signedUrl')
+            response = bucket.create_signed_urls(filenames, expires_in)
         except Exception as e:
-            print(f"Error getting signed URL for {filename}: {e}")
+            logger.error("Error signing documents in bucket %s: %s", bucket_name, e)
             return None
+        
+        signed = {}
+        for item in response:
+            if item.get('error'):
+                logger.error("Error getting signed URL for %s: %s", item.get('path'), item['error'])
+                continue
+            signed[item.get('path')] = item.get('signedURL') or item.get('signedUrl')
+        return signed
+    
+    @classmethod
+    def _sign_locally(cls, farmer_id: str, filename: str, expires_in: int) -> str:
+        """
+        Build a signed URL without calling Storage. The token is the same HS256
+        JWT Storage issues ({url, iat, exp} signed with the project JWT secret).
+        Only used when SUPABASE_JWT_SECRET is configured.
+        """
+        bucket_name = cls.get_farmer_bucket_name(farmer_id)
+        now = int(time.time())
+        token = jwt.encode(
+            {'url': f'{bucket_name}/{filename}', 'iat': now, 'exp': now + expires_in},
+            settings.SUPABASE_JWT_SECRET,
+            algorithm='HS256'
+        )
+        return (
+            f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1/object/sign/"
+            f"{bucket_name}/{quote(filename)}?token={token}"
+        )
+    
+    @classmethod
+    def invalidate_documents_cache(cls, farmer_id: str) -> None:
+        """Drop cached document lookups for a farmer (e.g. before a forced refresh)"""
+        bump_documents_version(farmer_id)
+    
+    @classmethod
+    def _documents_cache_key(cls, farmer_id: str, required_docs: List[str]) -> str:
+        docs_hash = hashlib.md5(','.join(required_docs).encode()).hexdigest()
+        return f"docs:{farmer_id}:{get_documents_version(farmer_id)}:{docs_hash}"
     
     @classmethod
     def fetch_required_documents(cls, farmer_id: str, required_docs: List[str]) -> Dict[str, Any]:
@@ -222,6 +442,9 @@ class SupabaseStorageService:
         Fetch required documents from farmer's bucket.
         Matches scheme requirements with available documents using aliases.
         
+        Results are cached until shortly before their signed URLs expire,
+        or until the farmer's bucket changes.
+        
         Args:
             farmer_id: The farmer's UUID
             required_docs: List of required document types (can be human-readable)
@@ -229,51 +452,93 @@ class SupabaseStorageService:
         Returns:
             Dict with found documents, missing documents, and signed URLs
         """
+        cache_key = cls._documents_cache_key(farmer_id, required_docs)
+        result = cache.get(cache_key)
+        if result is None:
+            result = cls._fetch_required_documents(farmer_id, required_docs)
+            # Don't cache empty lookups (transient listing failure) or ones
+            # with unsigned documents (transient signing failure)
+            found = result['found']
+            if found and all(doc.get('signed_url') for doc in found):
+                cache.set(cache_key, result, timeout=cls.DOCUMENTS_CACHE_TIMEOUT)
+        return result
+    
+    @classmethod
+    def _fetch_required_documents(cls, farmer_id: str, required_docs: List[str]) -> Dict[str, Any]:
+        """Uncached lookup behind fetch_required_documents"""
+        # Nothing required - no need to look at the bucket at all
+        if not required_docs:
+            return cls._documents_result([], [], required_docs)
+        
         # Get all documents in farmer's bucket
         available_docs = cls.list_farmer_documents(farmer_id)
         
-        # Create lookup by normalized document type
+        # Empty bucket (typical for a new farmer): everything is missing
+        if not available_docs:
+            missing_documents = [
+                cls._missing_document(required_doc, cls.normalize_document_type(required_doc))
+                for required_doc in required_docs
+            ]
+            return cls._documents_result([], missing_documents, required_docs)
+        
+        # Normalize the required document types once
+        required = [(required_doc, cls.normalize_document_type(required_doc)) for required_doc in required_docs]
+        wanted_types = {normalized_type for _, normalized_type in required}
+        
+        # First file of each wanted type; stop scanning once all are found
         docs_by_type = {}
         for doc in available_docs:
-            doc_type = doc['document_type']
-            if doc_type not in docs_by_type:
-                docs_by_type[doc_type] = doc
+            if doc.document_type in wanted_types and doc.document_type not in docs_by_type:
+                docs_by_type[doc.document_type] = doc
+                if len(docs_by_type) == len(wanted_types):
+                    break
         
-        print(f"Available doc types in bucket: {list(docs_by_type.keys())}")
+        logger.debug("Matched doc types in bucket: %s", list(docs_by_type))
         
         # Match required documents (with normalization)
         found_documents = []
         missing_documents = []
         
-        for required_doc in required_docs:
-            # Normalize the required document type
-            normalized_type = cls.normalize_document_type(required_doc)
-            
-            print(f"Looking for '{required_doc}' -> normalized to '{normalized_type}'")
+        for required_doc, normalized_type in required:
+            logger.debug("Looking for '%s' -> normalized to '%s'", required_doc, normalized_type)
             
             if normalized_type in docs_by_type:
                 doc = docs_by_type[normalized_type]
-                # Get signed URL
-                signed_url = cls.get_document_signed_url(farmer_id, doc['filename'])
-                
                 found_documents.append({
                     'document_type': required_doc,  # Keep original name for display
                     'internal_type': normalized_type,
-                    'filename': doc['filename'],
-                    'signed_url': signed_url,
+                    'filename': doc.filename,
+                    'signed_url': None,
                     'verified': True,
                     'status': 'attached'
                 })
             else:
-                missing_documents.append({
-                    'document_type': required_doc,
-                    'internal_type': normalized_type,
-                    'status': 'missing',
-                    'message': f'{required_doc} not found in your documents'
-                })
+                missing_documents.append(cls._missing_document(required_doc, normalized_type))
+        
+        # Sign every matched file in a single round-trip
+        signed_urls = cls.get_document_signed_urls(
+            farmer_id,
+            list(dict.fromkeys(doc['filename'] for doc in found_documents))
+        )
+        for doc in found_documents:
+            doc['signed_url'] = signed_urls.get(doc['filename'])
         
-        print(f"Found: {len(found_documents)}, Missing: {len(missing_documents)}")
+        logger.debug("Found: %d, Missing: %d", len(found_documents), len(missing_documents))
         
+        return cls._documents_result(found_documents, missing_documents, required_docs)
+    
+    @staticmethod
+    def _missing_document(required_doc: str, normalized_type: str) -> Dict[str, Any]:
+        return {
+            'document_type': required_doc,
+            'internal_type': normalized_type,
+            'status': 'missing',
+            'message': f'{required_doc} not found in your documents'
+        }
+    
+    @staticmethod
+    def _documents_result(found_documents: List[Dict[str, Any]], missing_documents: List[Dict[str, Any]],
+                          required_docs: List[str]) -> Dict[str, Any]:
         return {
             'found': found_documents,
             'missing': missing_documents,
@@ -302,5 +567,5 @@ class SupabaseStorageService:
                 client.storage.create_bucket(bucket_name, {'public': False})
                 return True
             except Exception as e:
-                print(f"Error creating bucket for farmer {farmer_id}: {e}")
+                logger.error("Error creating bucket for farmer %s: %s", farmer_id, e)
                 return False
@@ -0,0 +1,16 @@
+"""
+Applications App - Signal handlers
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Application
+from .services.status_counts import bump_status_counts_version
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_status_counts(sender, instance, **kwargs):
+    """Any change to an application can move the farmer's status counts"""
+    bump_status_counts_version(instance.farmer_id)
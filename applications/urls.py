@@ -2,7 +2,7 @@
 Applications App - URL Configuration
 """
 
-from django.urls import path
+from django.urls import include, path
 from .views import (
     ApplicationListView, ApplySchemeView, ApplicationPreviewView,
     ApplicationStatusView, ApplicationDetailView,
@@ -22,9 +22,11 @@ urlpatterns = [
     path('apply/', ApplySchemeView.as_view(), name='apply-scheme'),
     path('preview/', ApplicationPreviewView.as_view(), name='application-preview'),
     
-    # Application-specific endpoints
-    path('<uuid:application_id>/', ApplicationDetailView.as_view(), name='application-detail'),
-    path('<uuid:application_id>/status/', ApplicationStatusView.as_view(), name='application-status'),
-    path('<uuid:application_id>/track/', TrackApplicationView.as_view(), name='application-track'),
-    path('<uuid:application_id>/refresh-documents/', RefreshDocumentsView.as_view(), name='refresh-documents'),
+    # Application-specific endpoints (UUID prefix matched once, then the suffix)
+    path('<uuid:application_id>/', include([
+        path('', ApplicationDetailView.as_view(), name='application-detail'),
+        path('status/', ApplicationStatusView.as_view(), name='application-status'),
+        path('track/', TrackApplicationView.as_view(), name='application-track'),
+        path('refresh-documents/', RefreshDocumentsView.as_view(), name='refresh-documents'),
+    ])),
 ]
@@ -6,6 +6,7 @@ Full application flow with form generation, confirmation, and tracking
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 
 from .models import Application
@@ -14,18 +15,75 @@ from .serializers import (
     ApplicationCreateSerializer
 )
 from .services.autofill_service import AutoFillService
+from .services.status_counts import get_status_counts
 from schemes.models import Scheme
 from schemes.services.eligibility_engine import EligibilityEngine
+from schemes.services.scheme_cache import get_scheme
 from core.authentication import get_farmer_from_token
 
 
+def _get_farmer_application(farmer, application_id, queryset=None):
+    """
+    One of the farmer's applications, or None.
+    Joins the scheme by default and reuses the authenticated farmer for the
+    farmer relation instead of joining or re-fetching it.
+    """
+    if queryset is None:
+        queryset = Application.objects.select_related('scheme')
+    application = queryset.filter(id=application_id, farmer=farmer).first()
+    if application is not None:
+        application.farmer = farmer
+    return application
+
+
+def _application_not_found():
+    return Response({
+        'success': False,
+        'message': 'Application not found'
+    }, status=status.HTTP_404_NOT_FOUND)
+
+
+def _load_eligible_scheme(farmer, scheme_id):
+    """
+    Shared preamble of the apply flows: load the scheme and check the
+    farmer's eligibility for it.
+    Returns (scheme, None), or (None, error Response).
+    """
+    try:
+        scheme = get_scheme(scheme_id)
+    except Scheme.DoesNotExist:
+        return None, Response({
+            'success': False,
+            'message': 'Scheme not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    # Fast verdict first; the detailed evaluation only runs to report failures
+    if not EligibilityEngine.is_eligible(farmer, scheme):
+        eligibility = EligibilityEngine.check_eligibility(farmer, scheme)
+        return None, Response({
+            'success': False,
+            'message': 'You are not eligible for this scheme',
+            'data': {'failed_rules': eligibility['failed_rules']}
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return scheme, None
+
+
+class ApplicationListPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
 class ApplicationListView(APIView):
     """
     GET /api/applications/
     
     List all applications for the authenticated farmer.
+    Pass ?page=<n> (and optionally ?page_size=<n>) to get one page at a time;
+    without it the full list is returned as before.
     """
     permission_classes = [IsAuthenticated]
+    pagination_class = ApplicationListPagination
     
     def get(self, request):
         farmer = get_farmer_from_token(request)
@@ -35,27 +93,27 @@ class ApplicationListView(APIView):
                 'message': 'Farmer not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        applications = Application.objects.filter(farmer=farmer).select_related('scheme')
+        # Newest first, served by applications_farmer_created_idx
+        applications = ApplicationListSerializer.setup_queryset(
+            Application.objects.filter(farmer=farmer).order_by('-created_at')
+        )
+        
+        data = {}
+        paginator = self.pagination_class()
+        if paginator.page_query_param in request.query_params:
+            applications = paginator.paginate_queryset(applications, request, view=self)
+            data['pagination'] = {
+                'count': paginator.page.paginator.count,
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+            }
         serializer = ApplicationListSerializer(applications, many=True)
         
-        # Group by status
-        status_counts = {
-            'total': applications.count(),
-            'draft': applications.filter(status='DRAFT').count(),
-            'pending_confirmation': applications.filter(status='PENDING_CONFIRMATION').count(),
-            'pending': applications.filter(status='PENDING').count(),
-            'under_review': applications.filter(status='UNDER_REVIEW').count(),
-            'approved': applications.filter(status='APPROVED').count(),
-            'rejected': applications.filter(status='REJECTED').count(),
-            'incomplete': applications.filter(status='INCOMPLETE').count(),
-        }
-        
+        data['applications'] = serializer.data
+        data['status_counts'] = get_status_counts(farmer)
         return Response({
             'success': True,
-            'data': {
-                'applications': serializer.data,
-                'status_counts': status_counts
-            }
+            'data': data
         })
 
 
@@ -83,44 +141,21 @@ class GenerateFormView(APIView):
                 'message': 'scheme_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        try:
-            scheme = Scheme.objects.get(id=scheme_id)
-        except Scheme.DoesNotExist:
-            return Response({
-                'success': False,
-                'message': 'Scheme not found'
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # Check eligibility
-        eligibility = EligibilityEngine.check_eligibility(farmer, scheme)
-        if not eligibility['eligible']:
-            return Response({
-                'success': False,
-                'message': 'You are not eligible for this scheme',
-                'data': {'failed_rules': eligibility['failed_rules']}
-            }, status=status.HTTP_400_BAD_REQUEST)
+        scheme, error = _load_eligible_scheme(farmer, scheme_id)
+        if error:
+            return error
         
         # Create draft application with auto-filled form
         application, created = AutoFillService.create_draft_application(farmer, scheme)
         
         if not created and application:
-            # Application exists - refresh documents and return updated state
+            # Application exists - refresh documents (updates the instance in place)
             AutoFillService.refresh_documents(application)
-            application.refresh_from_db()  # Reload from database
             
             return Response({
                 'success': True,
                 'message': 'Application already exists',
-                'data': {
-                    'application_id': str(application.id),
-                    'tracking_id': application.tracking_id,
-                    'status': application.status,
-                    'is_confirmed': application.is_confirmed,
-                    'unified_form': application.auto_filled_data,
-                    'attached_documents': application.attached_documents,
-                    'missing_documents': application.missing_documents,
-                    'can_confirm': application.status == 'PENDING_CONFIRMATION'
-                }
+                'data': application.get_draft_info()
             })
         
         if not application:
@@ -129,19 +164,13 @@ class GenerateFormView(APIView):
                 'message': 'Could not create application'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
+        draft_info = application.get_draft_info()
         return Response({
             'success': True,
             'message': 'Application form generated successfully',
             'data': {
-                'application_id': str(application.id),
-                'tracking_id': application.tracking_id,
-                'status': application.status,
-                'unified_form': application.auto_filled_data,
-                'attached_documents': application.attached_documents,
-                'missing_documents': application.missing_documents,
-                'documents_complete': len(application.missing_documents) == 0,
-                'can_confirm': application.status == 'PENDING_CONFIRMATION',
-                'confirmation_message': 'Please review and confirm to submit' if application.status == 'PENDING_CONFIRMATION'
+                **draft_info,
+                'confirmation_message': 'Please review and confirm to submit' if draft_info['can_confirm']
                                        else f'Missing documents: {", ".join(application.missing_documents)}'
             }
         }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
@@ -170,13 +199,12 @@ class ConfirmApplicationView(APIView):
                 'message': 'application_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        try:
-            application = Application.objects.get(id=application_id, farmer=farmer)
-        except Application.DoesNotExist:
-            return Response({
-                'success': False,
-                'message': 'Application not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+        # Confirmation reads no relations and none of the JSON form payload
+        application = _get_farmer_application(
+            farmer, application_id, Application.objects.only(*Application.CONFIRM_FIELDS)
+        )
+        if application is None:
+            return _application_not_found()
         
         # Confirm the application
         result = AutoFillService.confirm_application(application)
@@ -216,16 +244,13 @@ class TrackApplicationView(APIView):
                 'message': 'Farmer not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        try:
-            application = Application.objects.select_related('scheme', 'farmer').get(
-                id=application_id,
-                farmer=farmer
-            )
-        except Application.DoesNotExist:
-            return Response({
-                'success': False,
-                'message': 'Application not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+        # One query: scheme joined, farmer already known, JSON form payload skipped
+        application = _get_farmer_application(
+            farmer, application_id,
+            Application.objects.select_related('scheme').only(*Application.TRACKING_FIELDS)
+        )
+        if application is None:
+            return _application_not_found()
         
         tracking_info = application.get_tracking_info()
         tracking_info['scheme_details'] = {
@@ -259,13 +284,9 @@ class RefreshDocumentsView(APIView):
                 'message': 'Farmer not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        try:
-            application = Application.objects.get(id=application_id, farmer=farmer)
-        except Application.DoesNotExist:
-            return Response({
-                'success': False,
-                'message': 'Application not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+        application = _get_farmer_application(farmer, application_id)
+        if application is None:
+            return _application_not_found()
         
         result = AutoFillService.refresh_documents(application)
         
@@ -310,21 +331,9 @@ class ApplySchemeView(APIView):
         
         scheme_id = serializer.validated_data['scheme_id']
         
-        try:
-            scheme = Scheme.objects.get(id=scheme_id)
-        except Scheme.DoesNotExist:
-            return Response({
-                'success': False,
-                'message': 'Scheme not found'
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        eligibility = EligibilityEngine.check_eligibility(farmer, scheme)
-        if not eligibility['eligible']:
-            return Response({
-                'success': False,
-                'message': 'You are not eligible for this scheme',
-                'data': {'failed_rules': eligibility['failed_rules']}
-            }, status=status.HTTP_400_BAD_REQUEST)
+        scheme, error = _load_eligible_scheme(farmer, scheme_id)
+        if error:
+            return error
         
         application, created = AutoFillService.create_application(farmer, scheme)
         
@@ -385,7 +394,7 @@ class ApplicationPreviewView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            scheme = Scheme.objects.get(id=scheme_id)
+            scheme = get_scheme(scheme_id)
         except Scheme.DoesNotExist:
             return Response({
                 'success': False,
@@ -414,16 +423,9 @@ class ApplicationStatusView(APIView):
                 'message': 'Farmer not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        try:
-            application = Application.objects.select_related('scheme').get(
-                id=application_id,
-                farmer=farmer
-            )
-        except Application.DoesNotExist:
-            return Response({
-                'success': False,
-                'message': 'Application not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+        application = _get_farmer_application(farmer, application_id)
+        if application is None:
+            return _application_not_found()
         
         return Response({
             'success': True,
@@ -445,16 +447,9 @@ class ApplicationDetailView(APIView):
                 'message': 'Farmer not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        try:
-            application = Application.objects.select_related('scheme', 'farmer').get(
-                id=application_id,
-                farmer=farmer
-            )
-        except Application.DoesNotExist:
-            return Response({
-                'success': False,
-                'message': 'Application not found'
-            }, status=status.HTTP_404_NOT_FOUND)
+        application = _get_farmer_application(farmer, application_id)
+        if application is None:
+            return _application_not_found()
         
         serializer = ApplicationSerializer(application)
         
@@ -0,0 +1,34 @@
+"""
+Partial index for OTP verification and invalidation, which both look up a
+phone's unused codes (verify also filters on expires_at).
+The otp_codes table is unmanaged (lives in Supabase), so the index is created
+with raw SQL and only on PostgreSQL.
+"""
+
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS otp_codes_unused_lookup_idx "
+        "ON otp_codes (phone, expires_at DESC) WHERE is_used = false"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS otp_codes_unused_lookup_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -3,40 +3,46 @@ Auth App - Serializers
 """
 
 from rest_framework import serializers
-import re
 
+# Separators stripped from user-entered phone numbers (whitespace, dashes, brackets, plus)
+_PHONE_STRIP_TBL = str.maketrans('', '', ' \t\n\r\f\v-()+')
 
-class PhoneLoginSerializer(serializers.Serializer):
+
+def _normalize_indian_phone(value: str) -> str:
+    """Strip separators and reduce to the 10-digit Indian number"""
+    phone = value.translate(_PHONE_STRIP_TBL)
+    if phone.startswith('91') and len(phone) == 12:
+        return phone[2:]
+    if len(phone) > 10:
+        return phone[-10:]
+    return phone
+
+
+class PhoneNormalizerMixin:
+    """validate_phone for serializers with a `phone` field"""
+    
+    def validate_phone(self, value):
+        """Standardize to 10-digit Indian phone number"""
+        return _normalize_indian_phone(value)
+
+
+class PhoneLoginSerializer(PhoneNormalizerMixin, serializers.Serializer):
     """Serializer for phone number login request"""
     phone = serializers.CharField(max_length=15, required=True)
     
     def validate_phone(self, value):
-        """Standardize to 10-digit Indian phone number"""
-        phone = re.sub(r'[\s\-\(\)\+]', '', value)
-        if phone.startswith('91') and len(phone) == 12:
-            phone = phone[2:]
-        elif len(phone) > 10:
-            phone = phone[-10:]
-            
+        """Standardize to 10-digit Indian phone number (and reject anything else)"""
+        phone = super().validate_phone(value)
         if not phone.isdigit() or len(phone) != 10:
             raise serializers.ValidationError("Please enter a valid 10-digit phone number.")
         return phone
 
 
-class OTPVerifySerializer(serializers.Serializer):
+class OTPVerifySerializer(PhoneNormalizerMixin, serializers.Serializer):
     """Serializer for OTP verification"""
     phone = serializers.CharField(max_length=15, required=True)
     otp = serializers.CharField(max_length=6, min_length=4, required=True)
     
-    def validate_phone(self, value):
-        """Standardize to 10-digit Indian phone number"""
-        phone = re.sub(r'[\s\-\(\)\+]', '', value)
-        if phone.startswith('91') and len(phone) == 12:
-            phone = phone[2:]
-        elif len(phone) > 10:
-            phone = phone[-10:]
-        return phone
-    
     def validate_otp(self, value):
         """Validate OTP format"""
         if not value.isdigit():
@@ -52,7 +58,7 @@ class TokenResponseSerializer(serializers.Serializer):
     is_new_user = serializers.BooleanField()
 
 
-class FarmerRegistrationSerializer(serializers.Serializer):
+class FarmerRegistrationSerializer(PhoneNormalizerMixin, serializers.Serializer):
     """
     Serializer for farmer registration (initial profile creation).
     Includes OTP verification and document submission.
@@ -77,15 +83,6 @@ class FarmerRegistrationSerializer(serializers.Serializer):
         allow_empty=True
     )
 
-    def validate_phone(self, value):
-        """Standardize to 10-digit Indian phone number"""
-        phone = re.sub(r'[\s\-\(\)\+]', '', value)
-        if phone.startswith('91') and len(phone) == 12:
-            phone = phone[2:]
-        elif len(phone) > 10:
-            phone = phone[-10:]
-        return phone
-
     def validate_document(self, value):
         """Validate document structure"""
         if 'document_type' not in value or 'document_url' not in value:
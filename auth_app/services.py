@@ -5,7 +5,9 @@ Handles OTP generation and verification
 
 import random
 import string
+import uuid
 from datetime import timedelta
+from django.db import connection, transaction
 from django.utils import timezone
 from django.conf import settings
 from .models import OTPCode
@@ -14,6 +16,11 @@ from .models import OTPCode
 class OTPService:
     """Service for OTP operations"""
     
+    # Read from settings once at import
+    OTP_LENGTH = getattr(settings, 'OTP_LENGTH', 6)
+    OTP_EXPIRY_MINUTES = getattr(settings, 'OTP_EXPIRY_MINUTES', 5)
+    OTP_EXPIRY = timedelta(minutes=OTP_EXPIRY_MINUTES)
+    
     @staticmethod
     def generate_otp(length=6):
         """Generate a random numeric OTP"""
@@ -25,26 +32,38 @@ class OTPService:
     def create_otp(cls, phone: str) -> str:
         """
         Create and store a new OTP for the given phone number.
-        Invalidates any existing unused OTPs for this phone.
+        Deletes this phone's earlier OTPs (used, expired or superseded), so
+        the table holds at most one code per phone.
         
         Returns: The generated OTP code
         """
-        # Invalidate existing OTPs for this phone
-        OTPCode.objects.filter(
-            phone=phone,
-            is_used=False
-        ).update(is_used=True)
-        
         # Generate new OTP
-        otp_code = cls.generate_otp(getattr(settings, 'OTP_LENGTH', 6))
-        expiry_minutes = getattr(settings, 'OTP_EXPIRY_MINUTES', 5)
+        otp_code = cls.generate_otp(cls.OTP_LENGTH)
+        now = timezone.now()
+        expires_at = now + cls.OTP_EXPIRY
         
-        # Create OTP record
-        OTPCode.objects.create(
-            phone=phone,
-            code=otp_code,
-            expires_at=timezone.now() + timedelta(minutes=expiry_minutes)
-        )
+        if connection.vendor == 'postgresql':
+            # Drop earlier OTPs and insert the new one in one round-trip
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "WITH cleared AS ("
+                    "  DELETE FROM otp_codes WHERE phone = %s"
+                    ") "
+                    "INSERT INTO otp_codes (id, phone, code, is_used, expires_at, created_at) "
+                    "VALUES (%s, %s, %s, false, %s, %s)",
+                    [phone, uuid.uuid4(), phone, otp_code, expires_at, now]
+                )
+        else:
+            with transaction.atomic():
+                # Drop earlier OTPs for this phone
+                OTPCode.objects.filter(phone=phone).delete()
+                
+                # Create OTP record
+                OTPCode.objects.create(
+                    phone=phone,
+                    code=otp_code,
+                    expires_at=expires_at
+                )
         
         # In production, send OTP via SMS here
         # For hackathon, we'll mock this
@@ -59,21 +78,15 @@ class OTPService:
         
         Returns: True if OTP is valid, False otherwise
         """
-        try:
-            otp_record = OTPCode.objects.filter(
-                phone=phone,
-                code=code,
-                is_used=False,
-                expires_at__gt=timezone.now()
-            ).latest('created_at')
-            
-            # Mark OTP as used
-            otp_record.is_used = True
-            otp_record.save()
-            
-            return True
-        except OTPCode.DoesNotExist:
-            return False
+        # Verify and consume in one UPDATE: the is_used guard means only one of
+        # two concurrent verifications can win. create_otp deletes older codes,
+        # so at most one unused code per phone can match.
+        return OTPCode.objects.filter(
+            phone=phone,
+            code=code,
+            is_used=False,
+            expires_at__gt=timezone.now()
+        ).update(is_used=True) > 0
     
     @classmethod
     def cleanup_expired_otps(cls):
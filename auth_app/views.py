@@ -4,6 +4,7 @@ Phone OTP-based authentication endpoints
 """
 
 import logging
+from django.db import IntegrityError, transaction
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -14,10 +15,30 @@ from .serializers import PhoneLoginSerializer, OTPVerifySerializer, FarmerRegist
 from .services import OTPService
 from farmers.models import Farmer
 from documents.models import Document
-from core.storage import create_farmer_bucket
+from core.storage import create_farmer_bucket_in_background
+from core.authentication import farmer_exists
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT when registering a farmer's documents
+DOCUMENT_BATCH_SIZE = 500
+
+
+def _generate_tokens(farmer):
+    """
+    Generate JWT tokens for farmer.
+    simplejwt builds its signing backend once per process, so each call
+    only assembles claims and signs.
+    """
+    refresh = RefreshToken()
+    refresh['farmer_id'] = str(farmer.id)
+    refresh['phone'] = farmer.phone
+    
+    return {
+        'access': str(refresh.access_token),
+        'refresh': str(refresh)
+    }
+
 
 class LoginView(APIView):
     """
@@ -42,15 +63,15 @@ class LoginView(APIView):
         otp_code = OTPService.create_otp(phone)
         
         # Check if farmer exists
-        farmer_exists = Farmer.objects.filter(phone=phone).exists()
+        is_existing_user = farmer_exists(phone)
         
         return Response({
             'success': True,
             'message': f'OTP sent to {phone}',
             'data': {
                 'phone': phone,
-                'is_existing_user': farmer_exists,
-                'otp_expiry_minutes': 5,
+                'is_existing_user': is_existing_user,
+                'otp_expiry_minutes': OTPService.OTP_EXPIRY_MINUTES,
                 # FOR DEMO ONLY - Remove in production!
                 'demo_otp': otp_code
             }
@@ -64,6 +85,9 @@ class VerifyOTPView(APIView):
     """
     permission_classes = [AllowAny]
     
+    # Columns read by _generate_tokens() and the response
+    FARMER_FIELDS = ('id', 'phone', 'name', 'state')
+    
     def post(self, request):
         serializer = OTPVerifySerializer(data=request.data)
         
@@ -84,28 +108,34 @@ class VerifyOTPView(APIView):
                 'message': 'Invalid or expired OTP'
             }, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Get or create farmer
-        farmer, is_new = Farmer.objects.get_or_create(
-            phone=phone,
-            defaults={
-                'name': '',
-                'state': '',
-                'district': '',
-                'village': '',
-                'land_size': 0,
-                'crop_type': '',
-                'language': 'hindi'
-            }
-        )
+        # Get or create farmer (only the columns used for the tokens and response)
+        farmer = Farmer.objects.filter(phone=phone).only(*self.FARMER_FIELDS).first()
+        is_new = False
+        if farmer is None:
+            # The lookup above already missed, so insert directly; the unique
+            # phone constraint catches a concurrent first login
+            try:
+                with transaction.atomic():
+                    farmer = Farmer.objects.create(
+                        phone=phone,
+                        name='',
+                        state='',
+                        district='',
+                        village='',
+                        land_size=0,
+                        crop_type='',
+                        language='hindi'
+                    )
+                is_new = True
+            except IntegrityError:
+                farmer = Farmer.objects.only(*self.FARMER_FIELDS).get(phone=phone)
         
         # Create storage bucket for new farmers
         if is_new:
-            bucket_created = create_farmer_bucket(str(farmer.id))
-            if not bucket_created:
-                logger.warning(f"Failed to create storage bucket for farmer {farmer.id}")
+            create_farmer_bucket_in_background(str(farmer.id))
         
         # Generate JWT tokens
-        tokens = self._generate_tokens(farmer)
+        tokens = _generate_tokens(farmer)
         
         return Response({
             'success': True,
@@ -118,17 +148,6 @@ class VerifyOTPView(APIView):
                 'profile_complete': bool(farmer.name and farmer.state)
             }
         }, status=status.HTTP_200_OK)
-    
-    def _generate_tokens(self, farmer):
-        """Generate JWT tokens for farmer"""
-        refresh = RefreshToken()
-        refresh['farmer_id'] = str(farmer.id)
-        refresh['phone'] = farmer.phone
-        
-        return {
-            'access': str(refresh.access_token),
-            'refresh': str(refresh)
-        }
 
 
 class RegisterView(APIView):
@@ -170,7 +189,9 @@ class RegisterView(APIView):
                 'message': 'User already registered. Please login instead.'
             }, status=status.HTTP_400_BAD_REQUEST)
             
-        if not farmer:
+        # The UUID pk is assigned on construction, so "new" is known here, not from pk
+        is_new_farmer = farmer is None
+        if is_new_farmer:
             farmer = Farmer(phone=phone)
             
         # Update/Set profile details
@@ -182,36 +203,35 @@ class RegisterView(APIView):
         farmer.crop_type = data['crop_type']
         farmer.language = data.get('language', 'hindi')
         
-        is_new_farmer = farmer.pk is None or not Farmer.objects.filter(pk=farmer.pk).exists()
-        farmer.save()
+        # Profile and documents are written in one transaction
+        with transaction.atomic():
+            farmer.save()
+            
+            # Handle Documents
+            documents_data = data.get('documents', [])
+            if documents_data:
+                # Delete existing documents if updating (optional strategy)
+                # Document.objects.filter(farmer=farmer).delete() 
+                
+                new_docs = []
+                for doc in documents_data:
+                    new_docs.append(Document(
+                        farmer=farmer,
+                        document_type=doc['document_type'],
+                        document_url=doc['document_url']
+                    ))
+                
+                if new_docs:
+                    Document.objects.bulk_create(new_docs, batch_size=DOCUMENT_BATCH_SIZE)
         
         # Create storage bucket for new farmers
         if is_new_farmer:
-            bucket_created = create_farmer_bucket(str(farmer.id))
-            if not bucket_created:
-                logger.warning(f"Failed to create storage bucket for farmer {farmer.id}")
-        
-        # Handle Documents
-        documents_data = data.get('documents', [])
-        if documents_data:
-            # Delete existing documents if updating (optional strategy)
-            # Document.objects.filter(farmer=farmer).delete() 
-            
-            new_docs = []
-            for doc in documents_data:
-                new_docs.append(Document(
-                    farmer=farmer,
-                    document_type=doc['document_type'],
-                    document_url=doc['document_url']
-                ))
-            
-            if new_docs:
-                Document.objects.bulk_create(new_docs)
+            create_farmer_bucket_in_background(str(farmer.id))
         
         # Generate tokens
         # We can reuse the Logic from VerifyOTPView if we move it to a helper or mixin
         # For now, duplicating the simple logic or calling helper if available methods
-        tokens = self._generate_tokens(farmer)
+        tokens = _generate_tokens(farmer)
         
         return Response({
             'success': True,
@@ -227,17 +247,6 @@ class RegisterView(APIView):
             }
         }, status=status.HTTP_201_CREATED)
 
-    def _generate_tokens(self, farmer):
-        """Generate JWT tokens for farmer"""
-        refresh = RefreshToken()
-        refresh['farmer_id'] = str(farmer.id)
-        refresh['phone'] = farmer.phone
-        
-        return {
-            'access': str(refresh.access_token),
-            'refresh': str(refresh)
-        }
-
 
 class RefreshTokenView(APIView):
     """
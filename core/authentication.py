@@ -3,10 +3,52 @@ Core - Authentication Utilities
 Helper functions for JWT token authentication
 """
 
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
 from farmers.models import Farmer
 
+logger = logging.getLogger(__name__)
+
+# Authenticated farmer rows are cached briefly, and only when the cache is
+# shared between processes (REDIS_URL): saves/deletes drop the entry for every
+# worker. Deactivations that skip signals (queryset.update(), raw SQL) are
+# still honoured up to FARMER_CACHE_TIMEOUT seconds late.
+FARMER_CACHE_TIMEOUT = 60
+
+
+# Login's "is this phone registered" answer. Only "yes" is cached, so a
+# registration in any worker is seen at once; a farmer deleted in another
+# LocMemCache process can still read as registered for this long.
+FARMER_EXISTS_CACHE_TIMEOUT = 60
+
+
+def farmer_cache_key(farmer_id) -> str:
+    return f"auth_farmer:{farmer_id}"
+
+
+def farmer_exists_cache_key(phone) -> str:
+    return f"farmer_exists:{phone}"
+
+
+def _farmer_cache_enabled() -> bool:
+    """Whether get_user() may serve farmers from the cache"""
+    return bool(getattr(settings, 'REDIS_URL', ''))
+
+
+def farmer_exists(phone) -> bool:
+    """Whether a farmer is registered with this (normalized) phone (positive answers cached)"""
+    cache_key = farmer_exists_cache_key(phone)
+    if cache.get(cache_key):
+        return True
+    exists = Farmer.objects.filter(phone=phone).exists()
+    if exists:
+        cache.set(cache_key, True, timeout=FARMER_EXISTS_CACHE_TIMEOUT)
+    return exists
+
 
 class FarmerAuthentication(JWTAuthentication):
     """
@@ -26,19 +68,25 @@ class FarmerAuthentication(JWTAuthentication):
             if not farmer_id:
                 raise InvalidToken('Token contains no farmer_id')
 
-            # Fetch farmer directly using UUID
-            farmer = Farmer.objects.get(id=farmer_id)
-            
-            if not farmer.is_active:
-                raise AuthenticationFailed('Farmer account is inactive')
+            # Fetch active farmer directly using UUID. With the per-process
+            # LocMemCache a save in another worker can't drop our entry, so
+            # read the row every time.
+            if not _farmer_cache_enabled():
+                return Farmer.objects.get(id=farmer_id, is_active=True)
+
+            # Shared cache: only active rows are cached, and saves drop the entry
+            cache_key = farmer_cache_key(farmer_id)
+            farmer = cache.get(cache_key)
+            if farmer is None:
+                farmer = Farmer.objects.get(id=farmer_id, is_active=True)
+                cache.set(cache_key, farmer, timeout=FARMER_CACHE_TIMEOUT)
 
             return farmer
 
         except Farmer.DoesNotExist:
-            raise AuthenticationFailed('Farmer not found', code='user_not_found')
+            raise AuthenticationFailed('Farmer not found or inactive', code='user_not_found')
         except Exception as e:
-            # Log the error for debugging
-            print(f"Authentication Error: {str(e)}")
+            logger.warning("Authentication Error: %s", e)
             raise AuthenticationFailed('Authentication failed', code='authentication_failed')
 
 
@@ -51,3 +99,14 @@ def get_farmer_from_token(request):
         return request.user
     return None
 
+
+
+def get_farmer_by_id(request, farmer_id):
+    """
+    Fetch a farmer by ID, reusing the already-authenticated farmer
+    when the ID is the caller's own. Raises Farmer.DoesNotExist.
+    """
+    farmer = get_farmer_from_token(request)
+    if farmer is not None and str(farmer.id) == str(farmer_id):
+        return farmer
+    return Farmer.objects.get(id=farmer_id)
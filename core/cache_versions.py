@@ -0,0 +1,44 @@
+"""
+Core - Versioned cache keys
+Cached entries embed a version number in their key; bumping the version
+orphans every entry built under the old one (they age out on their own
+timeout).
+
+Versions are seeded from the clock rather than starting at 0/1, so a
+version key that is evicted (or lost on restart) comes back as a new,
+never-used number instead of reviving entries cached under an old one.
+
+Versions live in the default cache. With Redis (REDIS_URL) every worker
+shares them, so a bump is seen everywhere on the next lookup. With the
+LocMemCache fallback each process keeps its own versions: a bump only
+reaches the process that made it, and other processes keep serving their
+entries until those entries' own timeout.
+"""
+
+import time
+
+from django.core.cache import cache
+
+
+def _seed() -> int:
+    return time.time_ns()
+
+
+def get_cache_version(key: str) -> int:
+    """Current version stored under key, seeding it if missing"""
+    version = cache.get(key)
+    if version is None:
+        seed = _seed()
+        cache.add(key, seed, timeout=None)
+        version = cache.get(key, seed)
+    return version
+
+
+def bump_cache_version(key: str) -> None:
+    """Move key to a new version, invalidating entries built on the old one"""
+    if not cache.add(key, _seed(), timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Key evicted between add() and incr()
+            cache.set(key, _seed(), timeout=None)
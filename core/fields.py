@@ -0,0 +1,50 @@
+"""
+Core - Custom Model Fields
+"""
+
+import json
+
+from django.db import models
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonEncoder(json.JSONEncoder):
+    """
+    json.JSONEncoder whose encode() runs orjson. Passed as a JSONField
+    encoder, it goes through the backend's adapt_json_value hook (the Jsonb
+    adapter on PostgreSQL). Like the stock encoder, it raises TypeError
+    for types JSON has no form for, such as Decimal.
+    """
+
+    def encode(self, o):
+        return orjson.dumps(o, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class OrjsonField(models.JSONField):
+    """
+    JSONField that encodes/decodes with orjson when it is installed.
+    Falls back to the stock json module otherwise.
+    """
+
+    def __init__(self, *args, **kwargs):
+        if orjson is not None:
+            kwargs.setdefault('encoder', OrjsonEncoder)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if kwargs.get('encoder') is OrjsonEncoder:
+            del kwargs['encoder']
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, expression, connection):
+        if orjson is None or self.decoder is not None or not isinstance(value, (str, bytes)):
+            return super().from_db_value(value, expression, connection)
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return value
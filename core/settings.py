@@ -98,6 +98,23 @@ else:
         }
     }
 
+# Cache Configuration - Redis when configured, per-process memory otherwise
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -172,6 +189,8 @@ CORS_ALLOWED_ORIGINS = [
 SUPABASE_URL = config('SUPABASE_URL', default='')
 SUPABASE_KEY = config('SUPABASE_KEY', default='')
 SUPABASE_SERVICE_KEY = config('SUPABASE_SERVICE_KEY', default='')
+# Project JWT secret: when set, storage URLs are signed locally instead of via the API
+SUPABASE_JWT_SECRET = config('SUPABASE_JWT_SECRET', default='')
 
 # AI Configuration
 GROQ_API_KEY = config('GROQ_API_KEY', default='')
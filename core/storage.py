@@ -4,13 +4,68 @@ Handles bucket creation and document storage for farmers.
 Each farmer gets their own bucket named 'farmer-{farmer_id}'.
 """
 
+import atexit
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.cache_versions import bump_cache_version, get_cache_version
 
 logger = logging.getLogger(__name__)
 
-# Lazy initialization of Supabase client
+# Creates new farmers' buckets off the request thread
+_bucket_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='bucket-create')
+
+# Lazy initialization of Supabase client (one per process, shared by all threads)
 _supabase_client = None
+_supabase_client_lock = threading.Lock()
+
+# Connection pool sizing for the shared Supabase HTTP client
+SUPABASE_HTTP_TIMEOUT = 20
+SUPABASE_HTTP_MAX_CONNECTIONS = 100
+SUPABASE_HTTP_MAX_KEEPALIVE = 50
+
+
+def _build_http_client():
+    """
+    One pooled, keep-alive httpx client for every Supabase sub-client
+    (storage, postgrest, auth), so calls reuse TCP/TLS connections.
+    HTTP/2 is used when the h2 package is available.
+    """
+    import httpx
+    
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    http_client = httpx.Client(
+        http2=http2,
+        timeout=SUPABASE_HTTP_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_HTTP_MAX_KEEPALIVE,
+        ),
+    )
+    atexit.register(http_client.close)
+    return http_client
+
+
+def _client_options():
+    """Client options carrying the shared HTTP client (None on older supabase-py)"""
+    try:
+        from supabase import ClientOptions
+    except ImportError:
+        return None
+    # supabase-py releases before httpx_client support build their own pools
+    if 'httpx_client' not in getattr(ClientOptions, '__dataclass_fields__', {}):
+        return None
+    return ClientOptions(httpx_client=_build_http_client())
 
 
 def get_supabase_client():
@@ -21,7 +76,12 @@ def get_supabase_client():
     """
     global _supabase_client
     
-    if _supabase_client is None:
+    if _supabase_client is not None:
+        return _supabase_client
+    
+    with _supabase_client_lock:
+        if _supabase_client is not None:
+            return _supabase_client
         try:
             from supabase import create_client
             
@@ -33,7 +93,11 @@ def get_supabase_client():
                 logger.warning("Supabase URL or Key not configured")
                 return None
             
-            _supabase_client = create_client(supabase_url, supabase_key)
+            options = _client_options()
+            if options is not None:
+                _supabase_client = create_client(supabase_url, supabase_key, options=options)
+            else:
+                _supabase_client = create_client(supabase_url, supabase_key)
             logger.info("Supabase client initialized successfully")
         except ImportError:
             logger.error("supabase package not installed. Run: pip install supabase")
@@ -53,6 +117,33 @@ def get_bucket_name(farmer_id: str) -> str:
     return f"farmer-{farmer_id}"
 
 
+def get_documents_version(farmer_id: str) -> int:
+    """
+    Current version of a farmer's stored documents.
+    Cached lookups of the farmer's bucket include this in their key.
+    """
+    return get_cache_version(f"docs_ver:{farmer_id}")
+
+
+def bump_documents_version(farmer_id: str) -> None:
+    """Invalidate cached lookups of a farmer's bucket after it changes"""
+    bump_cache_version(f"docs_ver:{farmer_id}")
+
+
+def signed_url_cache_key(farmer_id: str, file_path: str, expires_in: int) -> str:
+    """
+    Cache key for a signed document URL (shared with the applications
+    storage service). Not versioned: a signed URL covers the object path,
+    so it stays valid when the object is replaced.
+    """
+    return f"surl:{farmer_id}:{file_path}:{expires_in}"
+
+
+def signed_url_cache_timeout(expires_in: int) -> int:
+    """Reuse a signed URL for the first half of its lifetime"""
+    return expires_in // 2
+
+
 def create_farmer_bucket(farmer_id: str) -> bool:
     """
     Create a storage bucket for a farmer.
@@ -99,6 +190,18 @@ def create_farmer_bucket(farmer_id: str) -> bool:
         return False
 
 
+def create_farmer_bucket_in_background(farmer_id: str) -> None:
+    """
+    Schedule create_farmer_bucket() on a worker thread once the current
+    transaction commits, so signup/login responses don't wait on Storage.
+    """
+    def create():
+        if not create_farmer_bucket(farmer_id):
+            logger.warning(f"Failed to create storage bucket for farmer {farmer_id}")
+    
+    transaction.on_commit(lambda: _bucket_pool.submit(create))
+
+
 def upload_document(farmer_id: str, file, filename: str) -> str:
     """
     Upload a document to farmer's bucket.
@@ -119,26 +222,22 @@ def upload_document(farmer_id: str, file, filename: str) -> str:
     bucket_name = get_bucket_name(farmer_id)
     
     try:
-        # Read file content
-        file_content = file.read()
-        
         # Get content type from file if available
         content_type = getattr(file, 'content_type', 'application/octet-stream')
+        file_options = {"content-type": content_type}
+        bucket = client.storage.from_(bucket_name)
         
         # Upload to bucket
-        response = client.storage.from_(bucket_name).upload(
-            path=filename,
-            file=file_content,
-            file_options={"content-type": content_type}
-        )
+        if hasattr(file, 'temporary_file_path'):
+            # Django already spooled this upload to disk: hand over a file
+            # handle so httpx streams it instead of reading it all into memory
+            with open(file.temporary_file_path(), 'rb') as source:
+                bucket.upload(path=filename, file=source, file_options=file_options)
+        else:
+            bucket.upload(path=filename, file=file.read(), file_options=file_options)
         
-        # Get signed URL (valid for 1 year)
-        url_response = client.storage.from_(bucket_name).create_signed_url(
-            path=filename,
-            expires_in=31536000  # 1 year in seconds
-        )
-        
-        signed_url = url_response.get('signedURL', '')
+        signed_url = _stored_document_url(client, bucket_name, filename)
+        bump_documents_version(farmer_id)
         logger.info(f"Uploaded document to {bucket_name}/{filename}")
         return signed_url
         
@@ -147,6 +246,86 @@ def upload_document(farmer_id: str, file, filename: str) -> str:
         return ""
 
 
+def _stored_document_url(client, bucket_name: str, filename: str) -> str:
+    """Long-lived signed URL recorded on the Document row for an upload"""
+    url_response = client.storage.from_(bucket_name).create_signed_url(
+        path=filename,
+        expires_in=31536000  # 1 year in seconds
+    )
+    return url_response.get('signedURL', '')
+
+
+def create_upload_ticket(farmer_id: str, filename: str) -> dict:
+    """
+    Create a signed upload URL so the client can PUT a document straight
+    to the farmer's bucket, without the bytes passing through Django.
+    An existing file at the same path is replaced.
+    
+    Args:
+        farmer_id: UUID of the farmer
+        filename: Name for the file in storage
+        
+    Returns:
+        Dict with 'url', 'token' and 'path', or empty dict on error
+    """
+    client = get_supabase_client()
+    if not client:
+        logger.error("Cannot create upload ticket: Supabase client not available")
+        return {}
+    
+    bucket_name = get_bucket_name(farmer_id)
+    
+    try:
+        from storage3.types import CreateSignedUploadUrlOptions
+        
+        ticket = client.storage.from_(bucket_name).create_signed_upload_url(
+            filename,
+            CreateSignedUploadUrlOptions(upsert='true')
+        )
+        return {
+            'url': ticket['signed_url'],
+            'token': ticket['token'],
+            'path': ticket['path'],
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to create upload ticket for {bucket_name}/{filename}: {e}")
+        return {}
+
+
+def confirm_upload(farmer_id: str, filename: str) -> str:
+    """
+    Finish a direct upload started with create_upload_ticket().
+    
+    Args:
+        farmer_id: UUID of the farmer
+        filename: Name of the file in storage
+        
+    Returns:
+        Signed URL of the uploaded file, or empty string if it is missing or on error
+    """
+    client = get_supabase_client()
+    if not client:
+        logger.error("Cannot confirm upload: Supabase client not available")
+        return ""
+    
+    bucket_name = get_bucket_name(farmer_id)
+    
+    try:
+        if not client.storage.from_(bucket_name).exists(filename):
+            logger.warning(f"Upload not found in {bucket_name}/{filename}")
+            return ""
+        
+        signed_url = _stored_document_url(client, bucket_name, filename)
+        bump_documents_version(farmer_id)
+        logger.info(f"Confirmed direct upload to {bucket_name}/{filename}")
+        return signed_url
+        
+    except Exception as e:
+        logger.error(f"Failed to confirm upload to {bucket_name}/{filename}: {e}")
+        return ""
+
+
 def get_document_url(farmer_id: str, file_path: str, expires_in: int = 3600) -> str:
     """
     Get a signed URL for accessing a document.
@@ -159,6 +338,11 @@ def get_document_url(farmer_id: str, file_path: str, expires_in: int = 3600) ->
     Returns:
         Signed URL or empty string on error
     """
+    cache_key = signed_url_cache_key(farmer_id, file_path, expires_in)
+    signed_url = cache.get(cache_key)
+    if signed_url:
+        return signed_url
+    
     client = get_supabase_client()
     if not client:
         return ""
@@ -170,7 +354,10 @@ def get_document_url(farmer_id: str, file_path: str, expires_in: int = 3600) ->
             path=file_path,
             expires_in=expires_in
         )
-        return response.get('signedURL', '')
+        signed_url = response.get('signedURL', '')
+        if signed_url:
+            cache.set(cache_key, signed_url, timeout=signed_url_cache_timeout(expires_in))
+        return signed_url
         
     except Exception as e:
         logger.error(f"Failed to get URL for {bucket_name}/{file_path}: {e}")
@@ -196,6 +383,7 @@ def delete_document(farmer_id: str, file_path: str) -> bool:
     
     try:
         client.storage.from_(bucket_name).remove([file_path])
+        bump_documents_version(farmer_id)
         logger.info(f"Deleted document from {bucket_name}/{file_path}")
         return True
         
@@ -7,33 +7,132 @@ EasyOCR supports English, Hindi, and Marathi out of the box.
 Models are downloaded automatically on first use (~100-200MB).
 """
 
+import io
 import re
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
 
 logger = logging.getLogger(__name__)
 
+# ─── Aadhaar patterns (compiled once at import) ───
+_AADHAAR_NUM_RE = re.compile(r'\b(\d{4}\s?\d{4}\s?\d{4})\b')
+_DOB_RES = (
+    re.compile(r'(?:DOB|D\.?O\.?B\.?|Date of Birth|जन्म तिथि|Birth)\s*[:\-]?\s*(\d{2}[/\-\.]\d{2}[/\-\.]\d{4})'),
+    re.compile(r'(\d{2}[/\-\.]\d{2}[/\-\.]\d{4})'),  # Generic date
+    re.compile(r'(?:Year of Birth|YOB)\s*[:\-]?\s*(\d{4})'),  # Year only
+)
+_GENDER_RES = (
+    (re.compile(r'\b(MALE|Male|male|पुरुष)\b'), 'male'),
+    (re.compile(r'\b(FEMALE|Female|female|महिला|स्त्री)\b'), 'female'),
+    (re.compile(r'\b(TRANSGENDER|Transgender|transgender|तृतीय लिंग)\b'), 'other'),
+)
+_NAME_RES = (
+    re.compile(r'(?:Name|नाम)\s*[:\-]?\s*([A-Za-z\s]+)', re.IGNORECASE),
+)
+_DIGIT_RE = re.compile(r'\d')
+_LATIN_WORD_RE = re.compile(r'^[A-Za-z]+$')
+# Words dropped from a labelled name, and keywords that rule a line out as a name
+_NAME_NOISE_WORDS = frozenset({
+    'government', 'india', 'unique', 'identification', 'authority', 'aadhaar',
+    'aadhar', 'male', 'female', 'dob', 'address', 'year', 'birth',
+})
+_NAME_LINE_SKIP_KEYWORDS = ('government', 'india', 'aadhaar', 'unique', 'authority', 'address', 'dob')
+
+# ─── 7/12 patterns ───
+_VILLAGE_RES = (
+    re.compile(r'(?:गावाचे नाव|गाव|Village|मौजे)\s*[:\-]?\s*([^\n,]+)', re.IGNORECASE),
+    re.compile(r'(?:मौजा|मौजे|Mauza|Mouza)\s*[:\-]?\s*([^\n,]+)', re.IGNORECASE),
+)
+_TALUKA_RES = (
+    re.compile(r'(?:तालुका|Taluka|Ta\.?)\s*[:\-]?\s*([^\n,]+)', re.IGNORECASE),
+)
+_DISTRICT_RES = (
+    re.compile(r'(?:जिल्हा|District|Dist\.?|Jilha)\s*[:\-]?\s*([^\n,]+)', re.IGNORECASE),
+)
+_SURVEY_RES = (
+    re.compile(r'(?:गट\s*(?:क्र|नं)\.?|Survey\s*No\.?|Gut\s*No\.?|सर्वे\s*(?:क्र|नं)\.?)\s*[:\-]?\s*(\d+[\/\-]?\d*)', re.IGNORECASE),
+)
+_AREA_RES = (
+    # Hectare: "0.25 हे." or "1.50 Hectare"
+    re.compile(r'(\d+\.?\d*)\s*(?:हे\.?|हेक्टर|Hectare|Ha\.?|ha\.?)', re.IGNORECASE),
+    # Acre: "2.5 एकर" or "2.5 Acre"
+    re.compile(r'(\d+\.?\d*)\s*(?:एकर|Acre|Ac\.?)', re.IGNORECASE),
+    # Guntha: "10 गुंठे"
+    re.compile(r'(\d+\.?\d*)\s*(?:गुंठे|गुंठा|Guntha|Gunthe)', re.IGNORECASE),
+    # Generic area
+    re.compile(r'(?:क्षेत्र|क्षेत्रफळ|Area)\s*[:\-]?\s*(\d+\.?\d*)', re.IGNORECASE),
+)
+_OWNER_RES = (
+    re.compile(r'(?:खातेदाराचे नाव|खातेदार|Owner|Holder)\s*[:\-]?\s*([^\n]+)', re.IGNORECASE),
+    re.compile(r'(?:नाव|Name)\s*[:\-]?\s*([^\n]+)', re.IGNORECASE),
+)
+# Characters stripped from place names, and from owner names (which keep dots)
+_PLACE_JUNK_RE = re.compile(r'[^\w\s\u0900-\u097F]')
+_OWNER_JUNK_RE = re.compile(r'[^\w\s\u0900-\u097F\.]')
+
 # Lazy-loaded EasyOCR reader (models are loaded once and reused)
 _reader = None
+_reader_lock = threading.Lock()
+
+# Runs OCR off the request thread so the upload can proceed meanwhile. Kept
+# small: one inference already spreads across cores, and each extra
+# concurrent inference only adds memory and contention.
+_ocr_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ocr')
+
+# Longest image edge (px) fed to EasyOCR; card text stays legible well below
+# phone-camera resolution, and detector cost grows with pixel count
+AADHAAR_MAX_EDGE = 1600
+SEVEN_TWELVE_MAX_EDGE = 2000
+
+
+def _gpu_available() -> bool:
+    """Whether PyTorch (installed with EasyOCR) can see a CUDA device"""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def _downscale(image_content: bytes, max_edge: int):
+    """
+    Decode an uploaded image and shrink it so its longest edge is at most
+    max_edge. Returns the bytes unchanged if they are not a decodable image
+    (e.g. a PDF), leaving those to EasyOCR as before.
+    """
+    try:
+        import numpy as np
+        from PIL import Image, ImageOps
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(image_content)))
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        return np.asarray(image.convert('RGB'))
+    except (ImportError, OSError):
+        return image_content
 
 
 def _get_reader():
     """Get or create the EasyOCR reader (lazy initialization)"""
     global _reader
     if _reader is None:
-        try:
-            import easyocr
-            logger.info("Initializing EasyOCR reader (first load downloads models)...")
-            _reader = easyocr.Reader(
-                ['en', 'hi', 'mr'],  # English + Hindi + Marathi
-                gpu=False,           # CPU mode (works everywhere)
-            )
-            logger.info("EasyOCR reader initialized successfully")
-        except ImportError:
-            logger.error(
-                "EasyOCR is not installed. Install with: pip install easyocr"
-            )
-            raise
+        with _reader_lock:
+            if _reader is None:
+                try:
+                    import easyocr
+                    logger.info("Initializing EasyOCR reader (first load downloads models)...")
+                    gpu = _gpu_available()
+                    _reader = easyocr.Reader(
+                        ['en', 'hi', 'mr'],  # English + Hindi + Marathi
+                        gpu=gpu,             # CUDA when present, CPU otherwise
+                        quantize=True,       # int8 dynamic quantization on CPU
+                    )
+                    logger.info("EasyOCR reader initialized successfully (gpu=%s)", gpu)
+                except ImportError:
+                    logger.error(
+                        "EasyOCR is not installed. Install with: pip install easyocr"
+                    )
+                    raise
     return _reader
 
 
@@ -64,20 +163,33 @@ class OCRService:
     Supports English, Hindi, and Marathi.
     """
     
-    def _extract_text(self, image_content: bytes) -> str:
+    def submit(self, extract, file):
+        """
+        Run an extract_from_* method on the OCR pool and return its Future.
+        The file is read into memory first, so the caller can keep using
+        it (e.g. upload it to storage) while OCR runs.
+        """
+        content = io.BytesIO(file.read())
+        file.seek(0)
+        return _ocr_pool.submit(extract, content)
+    
+    def _extract_text(self, image_content: bytes, max_edge: int = AADHAAR_MAX_EDGE) -> str:
         """
         Extract text from image bytes using EasyOCR.
         
         Args:
             image_content: Raw image bytes
+            max_edge: Longest edge (px) the image is downscaled to first
             
         Returns:
             Extracted text as a single string
         """
         reader = _get_reader()
         
-        # EasyOCR can read from bytes directly
-        results = reader.readtext(image_content, detail=1, paragraph=True)
+        # Downscaled array for images; EasyOCR reads anything else from bytes.
+        # canvas_size stops the detector from scaling it back up.
+        image = _downscale(image_content, max_edge)
+        results = reader.readtext(image, detail=1, paragraph=True, canvas_size=max_edge)
         
         # results is a list of (bbox, text, confidence) tuples
         # Sort by vertical position (top to bottom) for natural reading order
@@ -110,7 +222,7 @@ class OCRService:
             file.seek(0)  # Reset file pointer for later use
             
             # Extract text using EasyOCR
-            raw_text = self._extract_text(image_content)
+            raw_text = self._extract_text(image_content, AADHAAR_MAX_EDGE)
             
             if not raw_text.strip():
                 return OCRResult(
@@ -166,9 +278,8 @@ class OCRService:
         full_text_joined = ' '.join(clean_lines)
         
         # ─── Extract Aadhaar Number (12 digits, possibly with spaces) ───
-        aadhaar_pattern = re.compile(r'\b(\d{4}\s?\d{4}\s?\d{4})\b')
         for line in clean_lines:
-            match = aadhaar_pattern.search(line)
+            match = _AADHAAR_NUM_RE.search(line)
             if match:
                 aadhaar_num = match.group(1).replace(' ', '')
                 if len(aadhaar_num) == 12:
@@ -176,13 +287,7 @@ class OCRService:
                     break
         
         # ─── Extract Date of Birth ───
-        dob_patterns = [
-            re.compile(r'(?:DOB|D\.?O\.?B\.?|Date of Birth|जन्म तिथि|Birth)\s*[:\-]?\s*(\d{2}[/\-\.]\d{2}[/\-\.]\d{4})'),
-            re.compile(r'(\d{2}[/\-\.]\d{2}[/\-\.]\d{4})'),  # Generic date
-            re.compile(r'(?:Year of Birth|YOB)\s*[:\-]?\s*(\d{4})'),  # Year only
-        ]
-        
-        for pattern in dob_patterns:
+        for pattern in _DOB_RES:
             match = pattern.search(full_text_joined)
             if match:
                 date_str = match.group(1)
@@ -208,33 +313,20 @@ class OCRService:
                     break
         
         # ─── Extract Gender ───
-        gender_patterns = [
-            (re.compile(r'\b(MALE|Male|male|पुरुष)\b'), 'male'),
-            (re.compile(r'\b(FEMALE|Female|female|महिला|स्त्री)\b'), 'female'),
-            (re.compile(r'\b(TRANSGENDER|Transgender|transgender|तृतीय लिंग)\b'), 'other'),
-        ]
-        
-        for pattern, gender_value in gender_patterns:
+        for pattern, gender_value in _GENDER_RES:
             if pattern.search(full_text_joined):
                 data['gender'] = gender_value
                 break
         
         # ─── Extract Name ───
-        name_patterns = [
-            re.compile(r'(?:Name|नाम)\s*[:\-]?\s*([A-Za-z\s]+)', re.IGNORECASE),
-        ]
-        
-        for pattern in name_patterns:
+        for pattern in _NAME_RES:
             match = pattern.search(full_text_joined)
             if match:
                 name = match.group(1).strip()
-                noise_words = ['government', 'india', 'unique', 'identification', 
-                              'authority', 'aadhaar', 'aadhar', 'male', 'female',
-                              'dob', 'address', 'year', 'birth']
                 name_words = name.split()
                 clean_name = ' '.join(
                     w for w in name_words 
-                    if w.lower() not in noise_words and len(w) > 1
+                    if len(w) > 1 and w.lower() not in _NAME_NOISE_WORDS
                 )
                 if clean_name and len(clean_name) > 2:
                     data['name'] = clean_name.title()
@@ -243,12 +335,13 @@ class OCRService:
         # Fallback: find name from lines
         if not data['name']:
             for line in clean_lines:
-                if re.search(r'\d', line):
+                if _DIGIT_RE.search(line):
                     continue
-                if any(kw in line.lower() for kw in ['government', 'india', 'aadhaar', 'unique', 'authority', 'address', 'dob']):
+                line_lower = line.lower()
+                if any(kw in line_lower for kw in _NAME_LINE_SKIP_KEYWORDS):
                     continue
                 words = line.split()
-                if 1 <= len(words) <= 5 and all(re.match(r'^[A-Za-z]+$', w) for w in words):
+                if 1 <= len(words) <= 5 and all(_LATIN_WORD_RE.match(w) for w in words):
                     data['name'] = line.title()
                     break
         
@@ -289,7 +382,7 @@ class OCRService:
             file.seek(0)
             
             # Extract text using EasyOCR
-            raw_text = self._extract_text(image_content)
+            raw_text = self._extract_text(image_content, SEVEN_TWELVE_MAX_EDGE)
             
             if not raw_text.strip():
                 return OCRResult(
@@ -350,68 +443,44 @@ class OCRService:
         full_text_joined = ' '.join(clean_lines)
         
         # ─── Extract Village ───
-        village_patterns = [
-            re.compile(r'(?:गावाचे नाव|गाव|Village|मौजे)\s*[:\-]?\s*([^\n,]+)', re.IGNORECASE),
-            re.compile(r'(?:मौजा|मौजे|Mauza|Mouza)\s*[:\-]?\s*([^\n,]+)', re.IGNORECASE),
-        ]
-        for pattern in village_patterns:
+        for pattern in _VILLAGE_RES:
             match = pattern.search(full_text_joined)
             if match:
                 village = match.group(1).strip()
-                village = re.sub(r'[^\w\s\u0900-\u097F]', '', village).strip()
+                village = _PLACE_JUNK_RE.sub('', village).strip()
                 if village and len(village) > 1:
                     data['village'] = village
                     break
         
         # ─── Extract Taluka ───
-        taluka_patterns = [
-            re.compile(r'(?:तालुका|Taluka|Ta\.?)\s*[:\-]?\s*([^\n,]+)', re.IGNORECASE),
-        ]
-        for pattern in taluka_patterns:
+        for pattern in _TALUKA_RES:
             match = pattern.search(full_text_joined)
             if match:
                 taluka = match.group(1).strip()
-                taluka = re.sub(r'[^\w\s\u0900-\u097F]', '', taluka).strip()
+                taluka = _PLACE_JUNK_RE.sub('', taluka).strip()
                 if taluka and len(taluka) > 1:
                     data['taluka'] = taluka
                     break
         
         # ─── Extract District ───
-        district_patterns = [
-            re.compile(r'(?:जिल्हा|District|Dist\.?|Jilha)\s*[:\-]?\s*([^\n,]+)', re.IGNORECASE),
-        ]
-        for pattern in district_patterns:
+        for pattern in _DISTRICT_RES:
             match = pattern.search(full_text_joined)
             if match:
                 district = match.group(1).strip()
-                district = re.sub(r'[^\w\s\u0900-\u097F]', '', district).strip()
+                district = _PLACE_JUNK_RE.sub('', district).strip()
                 if district and len(district) > 1:
                     data['district'] = district
                     break
         
         # ─── Extract Survey/Gut Number ───
-        survey_patterns = [
-            re.compile(r'(?:गट\s*(?:क्र|नं)\.?|Survey\s*No\.?|Gut\s*No\.?|सर्वे\s*(?:क्र|नं)\.?)\s*[:\-]?\s*(\d+[\/\-]?\d*)', re.IGNORECASE),
-        ]
-        for pattern in survey_patterns:
+        for pattern in _SURVEY_RES:
             match = pattern.search(full_text_joined)
             if match:
                 data['survey_number'] = match.group(1).strip()
                 break
         
         # ─── Extract Land Area ───
-        area_patterns = [
-            # Hectare: "0.25 हे." or "1.50 Hectare"
-            re.compile(r'(\d+\.?\d*)\s*(?:हे\.?|हेक्टर|Hectare|Ha\.?|ha\.?)', re.IGNORECASE),
-            # Acre: "2.5 एकर" or "2.5 Acre"
-            re.compile(r'(\d+\.?\d*)\s*(?:एकर|Acre|Ac\.?)', re.IGNORECASE),
-            # Guntha: "10 गुंठे"
-            re.compile(r'(\d+\.?\d*)\s*(?:गुंठे|गुंठा|Guntha|Gunthe)', re.IGNORECASE),
-            # Generic area
-            re.compile(r'(?:क्षेत्र|क्षेत्रफळ|Area)\s*[:\-]?\s*(\d+\.?\d*)', re.IGNORECASE),
-        ]
-        
-        for i, pattern in enumerate(area_patterns):
+        for i, pattern in enumerate(_AREA_RES):
             match = pattern.search(full_text_joined)
             if match:
                 area_value = float(match.group(1))
@@ -427,15 +496,11 @@ class OCRService:
                 break
         
         # ─── Extract Owner Name ───
-        owner_patterns = [
-            re.compile(r'(?:खातेदाराचे नाव|खातेदार|Owner|Holder)\s*[:\-]?\s*([^\n]+)', re.IGNORECASE),
-            re.compile(r'(?:नाव|Name)\s*[:\-]?\s*([^\n]+)', re.IGNORECASE),
-        ]
-        for pattern in owner_patterns:
+        for pattern in _OWNER_RES:
             match = pattern.search(full_text_joined)
             if match:
                 owner = match.group(1).strip()
-                owner = re.sub(r'[^\w\s\u0900-\u097F\.]', '', owner).strip()
+                owner = _OWNER_JUNK_RE.sub('', owner).strip()
                 if owner and len(owner) > 1:
                     data['owner_name'] = owner
                     break
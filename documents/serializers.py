@@ -26,13 +26,32 @@ class DocumentCreateSerializer(serializers.ModelSerializer):
         model = Document
         fields = ['document_type']
 
+    VALID_TYPES = frozenset(choice[0] for choice in Document.DOCUMENT_TYPES)
+
     def validate_document_type(self, value):
-        valid_types = [choice[0] for choice in Document.DOCUMENT_TYPES]
-        if value not in valid_types:
+        if value not in self.VALID_TYPES:
+            valid_types = [choice[0] for choice in Document.DOCUMENT_TYPES]
             raise serializers.ValidationError(f"Invalid document type. Must be one of: {valid_types}")
         return value
 
 
+class DirectUploadSerializer(serializers.Serializer):
+    """Document type and file extension for a direct-to-storage upload"""
+    document_type = serializers.ChoiceField(choices=Document.DOCUMENT_TYPES)
+    file_ext = serializers.CharField(max_length=5, required=False, default='bin')
+
+    def validate_file_ext(self, value):
+        value = value.lower().lstrip('.')
+        if not value.isalnum():
+            raise serializers.ValidationError("File extension must be letters and digits only")
+        return value
+
+    @property
+    def filename(self) -> str:
+        """Storage filename, named after the document type like the other upload paths"""
+        return f"{self.validated_data['document_type']}.{self.validated_data['file_ext']}"
+
+
 class DocumentListSerializer(serializers.ModelSerializer):
     """Minimal document info for listings"""
     document_type_display = serializers.CharField(source='get_document_type_display', read_only=True)
@@ -6,7 +6,8 @@ Updated with OCR extraction endpoints for onboarding flow
 from django.urls import path
 from .views import (
     DocumentListView, DocumentDetailView,
-    DocumentByFarmerView, OCRAadhaarView, OCRSevenTwelveView
+    DocumentByFarmerView, OCRAadhaarView, OCRSevenTwelveView,
+    DocumentUploadTicketView, DocumentUploadConfirmView
 )
 
 urlpatterns = [
@@ -16,6 +17,8 @@ urlpatterns = [
     
     # Document CRUD
     path('', DocumentListView.as_view(), name='document-list'),
+    path('upload-ticket/', DocumentUploadTicketView.as_view(), name='document-upload-ticket'),
+    path('upload-confirm/', DocumentUploadConfirmView.as_view(), name='document-upload-confirm'),
     path('farmer/<uuid:farmer_id>/', DocumentByFarmerView.as_view(), name='document-by-farmer'),
     path('document/<uuid:document_id>/', DocumentDetailView.as_view(), name='document-detail'),
 ]
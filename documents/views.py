@@ -16,10 +16,12 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from .models import Document
-from .serializers import DocumentSerializer, DocumentCreateSerializer, DocumentListSerializer
+from .serializers import (
+    DocumentSerializer, DocumentCreateSerializer, DocumentListSerializer, DirectUploadSerializer
+)
 from .ocr_service import OCRService
-from core.authentication import get_farmer_from_token
-from core.storage import upload_document, delete_document
+from core.authentication import get_farmer_from_token, get_farmer_by_id
+from core.storage import upload_document, delete_document, create_upload_ticket, confirm_upload
 from farmers.models import Farmer
 
 
@@ -59,9 +61,9 @@ class OCRAadhaarView(APIView):
                 'message': f'Invalid file type: {file.content_type}. Allowed: JPEG, PNG, WebP, PDF'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Run OCR
+        # Run OCR in the background while the document is uploaded
         ocr_service = OCRService()
-        result = ocr_service.extract_from_aadhaar(file)
+        ocr_future = ocr_service.submit(ocr_service.extract_from_aadhaar, file)
         
         # Upload document to storage
         file.seek(0)
@@ -80,6 +82,8 @@ class OCRAadhaarView(APIView):
                 document_url=document_url,
             )
         
+        result = ocr_future.result()
+        
         return Response({
             'success': result.success,
             'message': 'Aadhaar card processed successfully' if result.success else 'OCR extraction had issues',
@@ -128,9 +132,9 @@ class OCRSevenTwelveView(APIView):
                 'message': f'Invalid file type: {file.content_type}. Allowed: JPEG, PNG, WebP, PDF'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Run OCR
+        # Run OCR in the background while the document is uploaded
         ocr_service = OCRService()
-        result = ocr_service.extract_from_seven_twelve(file)
+        ocr_future = ocr_service.submit(ocr_service.extract_from_seven_twelve, file)
         
         # Upload document to storage
         file.seek(0)
@@ -149,6 +153,8 @@ class OCRSevenTwelveView(APIView):
                 document_url=document_url,
             )
         
+        result = ocr_future.result()
+        
         return Response({
             'success': result.success,
             'message': '7/12 Extract processed successfully' if result.success else 'OCR extraction had issues',
@@ -254,6 +260,93 @@ class DocumentListView(APIView):
         }, status=status.HTTP_201_CREATED)
 
 
+class DocumentUploadTicketView(APIView):
+    """
+    POST /api/documents/upload-ticket/
+    
+    Get a signed URL to upload a document directly to the farmer's storage
+    bucket. The client PUTs the file there, then calls upload-confirm/.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        farmer = get_farmer_from_token(request)
+        if not farmer:
+            return Response({
+                'success': False,
+                'message': 'Farmer not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = DirectUploadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'success': False,
+                'message': 'Invalid input',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        ticket = create_upload_ticket(str(farmer.id), serializer.filename)
+        if not ticket:
+            return Response({
+                'success': False,
+                'message': 'Failed to create upload URL'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        return Response({
+            'success': True,
+            'data': ticket
+        }, status=status.HTTP_200_OK)
+
+
+class DocumentUploadConfirmView(APIView):
+    """
+    POST /api/documents/upload-confirm/
+    
+    Record a document uploaded through an upload-ticket/ URL, replacing
+    any existing document of the same type.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        farmer = get_farmer_from_token(request)
+        if not farmer:
+            return Response({
+                'success': False,
+                'message': 'Farmer not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = DirectUploadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'success': False,
+                'message': 'Invalid input',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        document_type = serializer.validated_data['document_type']
+        document_url = confirm_upload(str(farmer.id), serializer.filename)
+        if not document_url:
+            return Response({
+                'success': False,
+                'message': f'Uploaded {document_type} not found in storage'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Delete existing document of same type
+        Document.objects.filter(farmer=farmer, document_type=document_type).delete()
+        
+        document = Document.objects.create(
+            farmer=farmer,
+            document_type=document_type,
+            document_url=document_url
+        )
+        
+        return Response({
+            'success': True,
+            'message': 'Document uploaded successfully',
+            'data': DocumentSerializer(document).data
+        }, status=status.HTTP_201_CREATED)
+
+
 class DocumentDetailView(APIView):
     """
     GET /api/documents/<document_id>/
@@ -321,7 +414,7 @@ class DocumentByFarmerView(APIView):
             }, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            target_farmer = Farmer.objects.get(id=farmer_id)
+            target_farmer = get_farmer_by_id(request, farmer_id)
         except Farmer.DoesNotExist:
             return Response({
                 'success': False,
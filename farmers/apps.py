@@ -5,3 +5,6 @@ class FarmersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'farmers'
     verbose_name = 'Farmers'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,33 @@
+"""
+Functional index on the normalized 10-digit phone number.
+The farmers table is unmanaged (lives in Supabase), so the index is created
+with raw SQL and only on PostgreSQL.
+"""
+
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS farmers_phone_normalized_idx ON farmers "
+        r"(right(regexp_replace(phone, '[\s\-\(\)\+]', '', 'g'), 10))"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS farmers_phone_normalized_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farmers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,17 @@
+"""
+Farmers App - Signal handlers
+"""
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.authentication import farmer_cache_key, farmer_exists_cache_key
+from .models import Farmer
+
+
+@receiver(post_save, sender=Farmer)
+@receiver(post_delete, sender=Farmer)
+def invalidate_cached_farmer(sender, instance, **kwargs):
+    """Drop the cached auth row and login existence flag for this farmer"""
+    cache.delete_many([farmer_cache_key(instance.pk), farmer_exists_cache_key(instance.phone)])
@@ -14,7 +14,7 @@ from .serializers import (
     FarmerSerializer, FarmerUpdateSerializer,
     FarmerOCRAutoFillSerializer
 )
-from core.authentication import get_farmer_from_token
+from core.authentication import get_farmer_from_token, get_farmer_by_id
 
 
 class ProfileView(APIView):
@@ -28,7 +28,7 @@ class ProfileView(APIView):
 
     def get(self, request, farmer_id):
         try:
-            farmer = Farmer.objects.get(id=farmer_id)
+            farmer = get_farmer_by_id(request, farmer_id)
             serializer = FarmerSerializer(farmer)
             return Response({
                 'success': True,
@@ -49,7 +49,7 @@ class ProfileView(APIView):
             }, status=status.HTTP_403_FORBIDDEN)
 
         try:
-            farmer = Farmer.objects.get(id=farmer_id)
+            farmer = get_farmer_by_id(request, farmer_id)
         except Farmer.DoesNotExist:
             return Response({
                 'success': False,
@@ -159,7 +159,7 @@ class FarmerDetailView(APIView):
     
     def get(self, request, farmer_id):
         try:
-            farmer = Farmer.objects.get(id=farmer_id)
+            farmer = get_farmer_by_id(request, farmer_id)
             serializer = FarmerSerializer(farmer)
             return Response({
                 'success': True,
@@ -39,24 +39,20 @@ def get_eligible_schemes_for_farmer(farmer):
         if scheme.is_expired:
             continue
 
-        rules = scheme.schemerule_set.all()  # already prefetched
-
-        # Schemes with NO rules are available to everyone
-        if not rules:
+        if passes_rules(farmer, scheme):
             eligible.append(scheme)
-            continue
 
-        # ALL rules must pass (early exit on first failure)
-        is_eligible = True
-        for rule in rules:
-            if not _evaluate_rule(farmer, rule):
-                is_eligible = False
-                break  # early exit
+    return eligible
 
-        if is_eligible:
-            eligible.append(scheme)
 
-    return eligible
+def passes_rules(farmer, scheme) -> bool:
+    """
+    True if the farmer satisfies ALL of the scheme's SchemeRule rows.
+    Stops at the first failing rule; use EligibilityEngine.check_eligibility()
+    when the matched/failed rule lists are needed.
+    Schemes with NO rules are available to everyone.
+    """
+    return all(_evaluate_rule(farmer, rule) for rule in scheme.schemerule_set.all())
 
 
 # ============================================================
@@ -162,11 +158,20 @@ class EligibilityEngine:
     and EligibilityEngine.check_eligibility() without changes.
     """
 
+    @staticmethod
+    def is_eligible(farmer, scheme) -> bool:
+        """Fast yes/no eligibility check (no rule lists, no document check)"""
+        return passes_rules(farmer, scheme)
+
     @classmethod
-    def check_eligibility(cls, farmer, scheme) -> Dict[str, Any]:
+    def check_eligibility(cls, farmer, scheme, farmer_doc_types=None) -> Dict[str, Any]:
         """
         Check if a farmer is eligible for a single scheme
         using its SchemeRule rows.
+
+        Callers checking many schemes for one farmer should fetch
+        Document.get_farmer_document_types(farmer) once and pass it
+        as farmer_doc_types to avoid a documents query per scheme.
         """
         rules = scheme.schemerule_set.all()
 
@@ -188,8 +193,10 @@ class EligibilityEngine:
         # Document check (keep existing behavior)
         missing_docs = []
         try:
-            from documents.models import Document
-            farmer_docs = Document.get_farmer_document_types(farmer)
+            if farmer_doc_types is None:
+                from documents.models import Document
+                farmer_doc_types = Document.get_farmer_document_types(farmer)
+            farmer_docs = set(farmer_doc_types)
             required_docs = scheme.required_documents or []
             missing_docs = [doc for doc in required_docs if doc not in farmer_docs]
         except Exception:
@@ -205,6 +212,15 @@ class EligibilityEngine:
             'has_all_documents': len(missing_docs) == 0
         }
 
+    @staticmethod
+    def _farmer_document_types(farmer):
+        """Fetch the farmer's document types once for a multi-scheme check"""
+        try:
+            from documents.models import Document
+            return set(Document.get_farmer_document_types(farmer))
+        except Exception:
+            return None
+
     @classmethod
     def get_eligible_schemes(cls, farmer, schemes=None) -> List[Dict[str, Any]]:
         """
@@ -218,13 +234,14 @@ class EligibilityEngine:
             for scheme in schemes:
                 if scheme.is_expired:
                     continue
-                rules = scheme.schemerule_set.all()
-                if not rules or all(_evaluate_rule(farmer, r) for r in rules):
+                if passes_rules(farmer, scheme):
                     eligible_scheme_objs.append(scheme)
 
+        farmer_doc_types = cls._farmer_document_types(farmer)
+
         result = []
         for scheme in eligible_scheme_objs:
-            eligibility = cls.check_eligibility(farmer, scheme)
+            eligibility = cls.check_eligibility(farmer, scheme, farmer_doc_types)
             result.append({
                 'scheme': scheme,
                 'scheme_id': str(scheme.id),
@@ -257,9 +274,11 @@ class EligibilityEngine:
                 .prefetch_related('schemerule_set')
             )
 
+        farmer_doc_types = cls._farmer_document_types(farmer)
+
         all_schemes = []
         for scheme in schemes:
-            result = cls.check_eligibility(farmer, scheme)
+            result = cls.check_eligibility(farmer, scheme, farmer_doc_types)
             all_schemes.append({
                 'scheme_id': str(scheme.id),
                 'name': scheme.name,
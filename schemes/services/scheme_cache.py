@@ -0,0 +1,38 @@
+"""
+Schemes - Cached scheme lookups for the apply flows
+Schemes (with their rules prefetched) are cached under a global version key
+that is bumped whenever a Scheme or SchemeRule row is saved or deleted.
+With a shared cache (REDIS_URL) every worker sees an edit on its next
+lookup; with the per-process LocMemCache fallback, other processes can
+serve the old scheme for up to SCHEME_CACHE_TIMEOUT.
+"""
+
+from django.core.cache import cache
+
+from core.cache_versions import bump_cache_version, get_cache_version
+
+SCHEMES_VERSION_KEY = 'schemes_ver'
+
+# Bounds cache growth, and staleness in processes that don't share the cache
+SCHEME_CACHE_TIMEOUT = 300
+
+
+def bump_schemes_version() -> None:
+    """Invalidate every cached scheme"""
+    bump_cache_version(SCHEMES_VERSION_KEY)
+
+
+def get_scheme(scheme_id):
+    """
+    Scheme by ID with schemerule_set prefetched (cached).
+    Raises Scheme.DoesNotExist like Scheme.objects.get().
+    """
+    from schemes.models import Scheme
+    
+    version = get_cache_version(SCHEMES_VERSION_KEY)
+    cache_key = f"scheme:{scheme_id}:{version}"
+    scheme = cache.get(cache_key)
+    if scheme is None:
+        scheme = Scheme.objects.prefetch_related('schemerule_set').get(id=scheme_id)
+        cache.set(cache_key, scheme, timeout=SCHEME_CACHE_TIMEOUT)
+    return scheme
@@ -0,0 +1,18 @@
+"""
+Schemes App - Signal handlers
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Scheme, SchemeRule
+from .services.scheme_cache import bump_schemes_version
+
+
+@receiver(post_save, sender=Scheme)
+@receiver(post_delete, sender=Scheme)
+@receiver(post_save, sender=SchemeRule)
+@receiver(post_delete, sender=SchemeRule)
+def invalidate_scheme_cache(sender, instance, **kwargs):
+    """Cached schemes carry their rules, so either model changing invalidates"""
+    bump_schemes_version()
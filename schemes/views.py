@@ -11,6 +11,7 @@ from .models import Scheme
 from .serializers import SchemeSerializer, SchemeListSerializer, EligibleSchemeSerializer
 from .services.eligibility_engine import EligibilityEngine, get_eligible_schemes_for_farmer
 from core.authentication import get_farmer_from_token
+from documents.models import Document
 
 
 class EligibleSchemesView(APIView):
@@ -45,9 +46,10 @@ class EligibleSchemesView(APIView):
         eligible_scheme_objs = get_eligible_schemes_for_farmer(farmer)
         
         # Prepare response with localized names
+        farmer_doc_types = Document.get_farmer_document_types(farmer)
         response_data = []
         for scheme in eligible_scheme_objs:
-            eligibility = EligibilityEngine.check_eligibility(farmer, scheme)
+            eligibility = EligibilityEngine.check_eligibility(farmer, scheme, farmer_doc_types)
             response_data.append({
                 'scheme_id': str(scheme.id),
                 'name': scheme.name,
@@ -17,6 +17,7 @@ import os
 from .services.intent_parser import IntentParser, ResponseGenerator, Intent
 from .services.voice_service import VoiceService
 from schemes.services.eligibility_engine import EligibilityEngine
+from schemes.services.scheme_cache import get_scheme
 from applications.services.autofill_service import AutoFillService
 from applications.models import Application
 from schemes.models import Scheme
@@ -342,7 +343,7 @@ class VoiceProcessView(APIView):
         scheme_data = target_scheme_data
         
         # Check if already applied
-        existing = Application.objects.filter(farmer=farmer, scheme=scheme).first()
+        existing = Application.objects.filter(farmer=farmer, scheme=scheme).only('id', 'status').first()
         if existing:
             response = ResponseGenerator.get_response(
                 Intent.APPLY_SCHEME, language, 'already_applied'
@@ -416,7 +417,7 @@ class VoiceProcessView(APIView):
             'id': str(app.id),
             'scheme_name': app.scheme.get_localized_name(language),
             'status': app.status,
-            'status_display': app.get_status_display(),
+            'status_display': app.status_display,
             'applied_on': app.created_at.isoformat()
         } for app in applications]
         
@@ -517,7 +518,7 @@ class VoiceConfirmView(APIView):
             
             if action == 'confirm_apply' and confirmed and scheme_id:
                 try:
-                    scheme = Scheme.objects.get(id=scheme_id)
+                    scheme = get_scheme(scheme_id)
                     application, created = AutoFillService.create_application(farmer, scheme)
                     
                     if created: